@@ -13,8 +13,8 @@ TRAINING_DIR = DATA_DIR / "training"
 
 # Model paths
 MODELS_DIR = DATA_DIR / "models"
-CLASSIFIER_MODEL_PATH = MODELS_DIR / "syllabus_classifier.pkl"
-VECTORIZER_MODEL_PATH = MODELS_DIR / "tfidf_vectorizer.pkl"
+GUARDRAIL_MODEL_PATH = MODELS_DIR / "guardrail_model.joblib"  # classifier + TF-IDF vectorizer
+GUARDRAIL_TRAIN_MATRIX_PATH = MODELS_DIR / "guardrail_train_matrix.joblib"  # for warm-start retraining
 FAISS_INDEX_PATH = MODELS_DIR / "faiss_index.bin"
 EMBEDDINGS_PATH = MODELS_DIR / "embeddings_metadata.pkl"
 
@@ -26,6 +26,10 @@ CHUNK_MIN_WORDS = 300
 CHUNK_MAX_WORDS = 500
 CHUNK_OVERLAP_WORDS = 50
 
+# PDF extraction backend: "pdfplumber" (layout-aware) or "pdfium" (much faster, but
+# splits words and leaves line breaks on some PDFs, e.g. the Grade 10 science textbook)
+PDF_BACKEND = os.getenv("PDF_BACKEND", "pdfplumber")
+
 # Embedding configuration
 EMBEDDING_DIM = 384  # sentence-transformers default
 EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
@@ -36,19 +40,38 @@ TFIDF_MIN_DF = 2
 TFIDF_MAX_DF = 0.8
 
 # Random Forest configuration
-RF_N_ESTIMATORS = 100
-RF_MAX_DEPTH = 20
+RF_N_ESTIMATORS = 30
+RF_MAX_DEPTH = 10
 RF_MIN_SAMPLES_SPLIT = 5
 RF_MIN_SAMPLES_LEAF = 2
+RF_N_JOBS = -1  # Parallel jobs for training (-1 = all cores)
+# joblib compression for the saved model: 0 keeps it memory-mappable, 3 or ("lz4", 3) shrinks it
+GUARDRAIL_MODEL_COMPRESS = 0
 
 # Classification threshold
 SYLLABUS_CONFIDENCE_THRESHOLD = 0.6
 
+# Guardrail prediction cache (repeated questions skip the classifier)
+GUARDRAIL_CACHE_SIZE = 4096
+PREDICTION_CACHE_PATH = MODELS_DIR / "prediction_cache.sqlite3"  # None disables the disk cache
+
+# Guardrail request batching (concurrent /ask questions share one prediction)
+GUARDRAIL_BATCH_MAX_SIZE = 32
+GUARDRAIL_BATCH_WAIT_MS = 5
+
 # FastAPI configuration
 API_TITLE = "Guru.ai Backend"
 API_DESCRIPTION = "Closed-syllabus AI system for Sri Lankan students"
 API_VERSION = "1.0.0"
 
+# CORS: comma-separated allowed origins (default: the React dev server)
+CORS_ORIGINS = tuple(
+    origin.strip()
+    for origin in os.getenv("CORS_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000").split(",")
+    if origin.strip()
+)
+CORS_ALLOW_CREDENTIALS = os.getenv("CORS_ALLOW_CREDENTIALS", "false").lower() == "true"
+
 # Supported grades and subjects (Sri Lanka curriculum)
 SUPPORTED_GRADES = ["Grade 6", "Grade 7", "Grade 8", "Grade 9", "Grade 10", "Grade 11", "Grade 12", "Grade 13"]
 SUPPORTED_SUBJECTS = ["Mathematics", "Science", "English", "Sinhala", "Tamil", "History", "Civics", "Geography"]
@@ -60,6 +83,16 @@ MSG_PROCESSING_ERROR = "An error occurred while processing your question. Please
 
 # FAISS configuration
 FAISS_TOP_K_CHUNKS = 5  # Number of chunks to retrieve for context
+FAISS_INDEX_TYPE = "flat"  # "flat" (exact), "flat_fp16" (exact, half memory), "hnsw" or "ivfpq" (approximate)
+MAX_CONTEXT_CHARS = 8000  # Character budget for the answer context
+# OpenMP threads per process for FAISS searches. Defaults to the cores split
+# evenly across server workers (WEB_CONCURRENCY, set by run.py --workers)
+FAISS_OMP_THREADS = int(
+    os.getenv(
+        "FAISS_OMP_THREADS",
+        max(1, (os.cpu_count() or 1) // max(1, int(os.getenv("WEB_CONCURRENCY", "1")))),
+    )
+)
 
 # Logging
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -0,0 +1,33 @@
+"""
+Shared service instances - one of each per process, created on first use
+"""
+from functools import lru_cache
+from app.services.ai_engine import AIEngine
+from app.services.guardrail import Guardrail
+from app.services.guardrail_batcher import GuardrailBatcher
+from app.services.vector_store import VectorStore
+from app import config
+
+
+@lru_cache(maxsize=1)
+def get_guardrail() -> Guardrail:
+    """Get the process-wide guardrail (models are loaded by the API start-up hook)"""
+    return Guardrail()
+
+
+@lru_cache(maxsize=1)
+def get_guardrail_batcher() -> GuardrailBatcher:
+    """Get the process-wide guardrail request batcher"""
+    return GuardrailBatcher(get_guardrail())
+
+
+@lru_cache(maxsize=1)
+def get_vector_store() -> VectorStore:
+    """Get the process-wide vector store"""
+    return VectorStore(index_type=config.FAISS_INDEX_TYPE)
+
+
+@lru_cache(maxsize=1)
+def get_ai_engine() -> AIEngine:
+    """Get the process-wide AI engine"""
+    return AIEngine()
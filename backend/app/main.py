@@ -4,7 +4,7 @@ FastAPI application initialization
 import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from app import config
 from app.routes import chat
 
@@ -20,13 +20,14 @@ app = FastAPI(
     title=config.API_TITLE,
     description=config.API_DESCRIPTION,
     version=config.API_VERSION,
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, specify actual origins
-    allow_credentials=True,
+    allow_origins=config.CORS_ORIGINS,
+    allow_credentials=config.CORS_ALLOW_CREDENTIALS,
     allow_methods=["*"],
     allow_headers=["*"],
 )
@@ -36,6 +37,24 @@ app.add_middleware(
 app.include_router(chat.router)
 
 
+@app.on_event("startup")
+async def warm_up():
+    """
+    Load models before accepting traffic so the first request isn't a cold start
+
+    The guardrail batcher only starts once the models have loaded. If warm-up
+    fails, /ask retries it and checks questions directly until the next start.
+    """
+    if await chat.warm_up_services():
+        chat.guardrail_batcher.start()
+
+
+@app.on_event("shutdown")
+async def shut_down():
+    """Stop background tasks"""
+    await chat.guardrail_batcher.stop()
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -61,7 +80,7 @@ async def health():
 async def general_exception_handler(request, exc):
     """Handle general exceptions"""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error"},
     )
@@ -1,132 +1,174 @@
 """
 Chat routes - FastAPI endpoints for question answering
 """
+import asyncio
 import logging
+from typing import Dict, List, Optional
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from app.models.schema import AskQuestionRequest, AskQuestionResponse, TextbookChunk
-from app.services.guardrail import Guardrail
-from app.services.vector_store import VectorStore
-from app.services.ai_engine import AIEngine
+from app.dependencies import (
+    get_ai_engine,
+    get_guardrail,
+    get_guardrail_batcher,
+    get_vector_store,
+)
 from app import config
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1", tags=["chat"])
 
-# Initialize services (in production, use dependency injection)
-guardrail = Guardrail()
-vector_store = VectorStore()
-ai_engine = AIEngine()
+# Process-wide service instances, shared with any other module that needs them
+guardrail = get_guardrail()
+vector_store = get_vector_store()
+ai_engine = get_ai_engine()
+guardrail_batcher = get_guardrail_batcher()
 
-# Global flag for initialization
+# Global flags for initialization
 _initialized = False
+_vs_ready = False  # vector store loaded and non-empty; refreshed on (re)load
+_warm_up_lock = asyncio.Lock()
 
+# Request validation lookups, bound once at import
+_GRADES = frozenset(config.SUPPORTED_GRADES)
+_SUBJECTS = frozenset(config.SUPPORTED_SUBJECTS)
+_UNSUPPORTED_GRADE_MSG = f"Unsupported grade. Supported: {config.SUPPORTED_GRADES}"
+_UNSUPPORTED_SUBJECT_MSG = f"Unsupported subject. Supported: {config.SUPPORTED_SUBJECTS}"
+_CHUNK_FIELDS = tuple(TextbookChunk.model_fields)
 
-def initialize_services():
-    """Initialize all services"""
+
+def _load_guardrail():
+    """Load the guardrail classifier from disk"""
+    guardrail.load_model()
+    logger.info("Guardrail initialized")
+
+
+def _load_vector_store():
+    """Load the FAISS index and chunk metadata from disk, if present"""
+    global _vs_ready
+
+    if config.FAISS_INDEX_PATH.exists() and config.EMBEDDINGS_PATH.exists():
+        vector_store.load(str(config.FAISS_INDEX_PATH), str(config.EMBEDDINGS_PATH))
+        logger.info("Vector store initialized")
+
+    _vs_ready = not vector_store.is_empty()
+
+
+async def warm_up_services() -> bool:
+    """
+    Initialize all services
+
+    The guardrail pickles and the FAISS index are loaded in worker threads so
+    their deserialization overlaps instead of running back to back, and the
+    event loop stays free while they load. Concurrent callers share one
+    attempt; a failed attempt is retried by the next caller.
+
+    Returns:
+        True if services are ready
+    """
     global _initialized
 
-    if _initialized:
-        return
+    async with _warm_up_lock:
+        if _initialized:
+            return True
 
-    try:
-        # Load guardrail model
-        guardrail.load_model()
-        logger.info("Guardrail initialized")
+        try:
+            await asyncio.gather(
+                asyncio.to_thread(_load_guardrail),
+                asyncio.to_thread(_load_vector_store),
+            )
 
-        # Load vector store
-        if config.FAISS_INDEX_PATH.exists() and config.EMBEDDINGS_PATH.exists():
-            vector_store.load(str(config.FAISS_INDEX_PATH), str(config.EMBEDDINGS_PATH))
-            logger.info("Vector store initialized")
+            _initialized = True
+            logger.info("All services initialized successfully")
 
-        _initialized = True
-        logger.info("All services initialized successfully")
+        except Exception as e:
+            logger.error(f"Failed to initialize services: {e}")
+            _initialized = False
 
-    except Exception as e:
-        logger.error(f"Failed to initialize services: {e}")
-        _initialized = False
+        return _initialized
 
 
-@router.post("/ask", response_model=AskQuestionResponse)
+@router.post(
+    "/ask",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": AskQuestionResponse}},
+)
 async def ask_question(request: AskQuestionRequest) -> AskQuestionResponse:
     """
     Ask a question about the textbook content
 
+    The response is serialized directly with orjson instead of going through
+    FastAPI's response_model validation, since every field is built here.
+
     Args:
         request: AskQuestionRequest with grade, subject, and question
 
     Returns:
         AskQuestionResponse with answer and metadata
     """
-    if not _initialized:
-        initialize_services()
+    if not _initialized and not await warm_up_services():
+        # Normally warmed up at startup; this retries a failed warm-up off the event loop
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service not available",
+        )
 
     try:
         # Validate grade and subject
-        if request.grade not in config.SUPPORTED_GRADES:
+        if request.grade not in _GRADES:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Unsupported grade. Supported: {config.SUPPORTED_GRADES}",
+                detail=_UNSUPPORTED_GRADE_MSG,
             )
 
-        if request.subject not in config.SUPPORTED_SUBJECTS:
+        if request.subject not in _SUBJECTS:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Unsupported subject. Supported: {config.SUPPORTED_SUBJECTS}",
+                detail=_UNSUPPORTED_SUBJECT_MSG,
             )
 
         logger.info(f"Processing question for {request.grade} {request.subject}")
         logger.debug(f"Question: {request.question[:100]}...")
 
         # Step 1: Check if question is in syllabus using guardrail
-        is_in_syllabus, confidence = guardrail.is_in_syllabus(request.question)
+        is_in_syllabus, confidence = await guardrail_batcher.is_in_syllabus(request.question)
+
+        if not is_in_syllabus:
+            return _build_response(
+                request, is_in_syllabus, confidence, config.MSG_OUT_OF_SYLLABUS, "out_of_syllabus"
+            )
 
         # Step 2: Retrieve relevant chunks from vector store
-        source_chunks = []
-        page_references = []
+        chunks = []
 
-        if is_in_syllabus and not vector_store.is_empty():
+        if _vs_ready:
             # For MVP, we'll use simple keyword matching instead of embeddings
             # In production, use actual semantic similarity
             chunks = _retrieve_chunks_keyword(request.question, request.grade, request.subject)
 
-            for chunk_dict in chunks:
-                chunk = TextbookChunk(**chunk_dict)
-                source_chunks.append(chunk)
-                if chunk.page_number not in page_references:
-                    page_references.append(chunk.page_number)
+        if not chunks:
+            return _build_response(
+                request, is_in_syllabus, confidence, config.MSG_NO_CONTENT, "no_content"
+            )
+
+        page_references = {chunk_dict["page_number"] for chunk_dict in chunks}
 
         # Step 3: Generate answer
-        if is_in_syllabus:
-            if source_chunks:
-                chunks_dicts = [chunk.dict() for chunk in source_chunks]
-                answer = ai_engine.generate_answer(
-                    request.question, chunks_dicts, request.grade, request.subject
-                )
-                status_str = "success"
-            else:
-                answer = config.MSG_NO_CONTENT
-                status_str = "no_content"
-        else:
-            answer = config.MSG_OUT_OF_SYLLABUS
-            status_str = "out_of_syllabus"
-
-        # Build response
-        response = AskQuestionResponse(
-            question=request.question,
-            grade=request.grade,
-            subject=request.subject,
-            is_in_syllabus=is_in_syllabus,
-            confidence=confidence,
-            answer=answer,
-            source_chunks=source_chunks,
-            page_references=sorted(page_references),
-            status=status_str,
+        # Raw chunk dicts go straight to the engine, no model round-trip
+        answer = ai_engine.generate_answer(
+            request.question, chunks, request.grade, request.subject
         )
 
-        logger.info(f"Question processed | Status: {status_str} | Confidence: {confidence:.3f}")
-
-        return response
+        return _build_response(
+            request,
+            is_in_syllabus,
+            confidence,
+            answer,
+            "success",
+            source_chunks=chunks,
+            page_references=sorted(page_references),
+        )
 
     except HTTPException:
         raise
@@ -138,6 +180,55 @@ async def ask_question(request: AskQuestionRequest) -> AskQuestionResponse:
         )
 
 
+def _build_response(
+    request: AskQuestionRequest,
+    is_in_syllabus: bool,
+    confidence: float,
+    answer: str,
+    status_str: str,
+    source_chunks: Optional[List[Dict]] = None,
+    page_references: Optional[List[int]] = None,
+) -> ORJSONResponse:
+    """
+    Build the /ask response without Pydantic validation
+
+    Args:
+        request: The original request
+        is_in_syllabus: Guardrail decision
+        confidence: Guardrail confidence
+        answer: Answer text
+        status_str: Response status (success, out_of_syllabus, no_content)
+        source_chunks: Chunk dicts the answer was built from
+        page_references: Sorted page numbers of the source chunks
+
+    Returns:
+        ORJSONResponse with the serialized AskQuestionResponse
+    """
+    response = AskQuestionResponse.model_construct(
+        question=request.question,
+        grade=request.grade,
+        subject=request.subject,
+        is_in_syllabus=is_in_syllabus,
+        confidence=confidence,
+        answer=answer,
+        source_chunks=[],
+        page_references=page_references or [],
+        status=status_str,
+    )
+    content = response.model_dump()
+
+    if source_chunks:
+        # Chunks come from our own chunker, so project the raw dicts onto the
+        # TextbookChunk fields instead of building models only to dump them again
+        content["source_chunks"] = [
+            {field: chunk[field] for field in _CHUNK_FIELDS} for chunk in source_chunks
+        ]
+
+    logger.info(f"Question processed | Status: {status_str} | Confidence: {confidence:.3f}")
+
+    return ORJSONResponse(content=content)
+
+
 def _retrieve_chunks_keyword(question: str, grade: str, subject: str) -> list:
     """
     Retrieve chunks using keyword matching (MVP approach)
@@ -164,16 +255,14 @@ def _retrieve_chunks_keyword(question: str, grade: str, subject: str) -> list:
 
 @router.get("/health")
 async def health_check() -> dict:
-    """Health check endpoint"""
+    """Health check endpoint (read-only: reports readiness without loading anything)"""
     try:
-        initialize_services()
-
         return {
             "status": "healthy",
             "message": "Guru.ai backend is running",
             "services": {
                 "guardrail": "ready" if _initialized else "not_ready",
-                "vector_store": "ready" if not vector_store.is_empty() else "empty",
+                "vector_store": "ready" if _vs_ready else "empty",
                 "ai_engine": "ready",
             },
         }
@@ -187,9 +276,7 @@ async def health_check() -> dict:
 
 @router.get("/status")
 async def status_endpoint() -> dict:
-    """Get service status and statistics"""
-    initialize_services()
-
+    """Get service status and statistics (read-only: never loads services)"""
     return {
         "status": "running",
         "version": config.API_VERSION,
@@ -1,13 +1,24 @@
 """
 AI Engine - Generates answers based on textbook content
 """
+import io
 import logging
+import re
+from itertools import islice
 from typing import List, Dict, Optional
 from app import config
 from app.models.schema import TextbookChunk
 
 logger = logging.getLogger(__name__)
 
+# Significant words (5+ characters) used to check answer grounding
+_SIGNIFICANT_WORD_RE = re.compile(r"\w{5,}")
+
+# A sentence: text starting at a non-blank character, up to and including its
+# terminator (or the end of the text). Anchoring on the first non-blank keeps
+# the scan linear on whitespace-only runs.
+_SENTENCE_RE = re.compile(r"[^\s.!?][^.!?]*[.!?]?")
+
 
 class AIEngine:
     """Generates answers based on retrieved textbook chunks"""
@@ -55,7 +66,7 @@ class AIEngine:
 
     def _build_context(self, chunks: List[Dict]) -> str:
         """
-        Build context string from chunks
+        Build context string from chunks, capped at config.MAX_CONTEXT_CHARS
 
         Args:
             chunks: List of chunk dictionaries
@@ -63,15 +74,27 @@ class AIEngine:
         Returns:
             Context string
         """
-        context_parts = []
+        buf = io.StringIO()
+        written = 0
+        limit = config.MAX_CONTEXT_CHARS
 
-        for chunk in chunks[:config.FAISS_TOP_K_CHUNKS]:
+        for i, chunk in enumerate(chunks[:config.FAISS_TOP_K_CHUNKS]):
             content = chunk.get("content", "")
             page_num = chunk.get("page_number", "?")
 
-            context_parts.append(f"[Page {page_num}]:\n{content}")
+            part = f"[Page {page_num}]:\n{content}"
+            if i:
+                part = "\n\n" + part
+
+            # Stop at the character budget instead of building an oversized context
+            if written + len(part) > limit:
+                buf.write(part[:limit - written])
+                break
 
-        return "\n\n".join(context_parts)
+            buf.write(part)
+            written += len(part)
+
+        return buf.getvalue()
 
     def _generate_from_context(
         self, question: str, context: str, grade: str, subject: str
@@ -110,10 +133,9 @@ In summary, {self._extract_summary_from_context(context)}"""
         Returns:
             Summary
         """
-        # Simple heuristic: take first 3 sentences
-        sentences = context.split(".")
-        summary_sentences = [s.strip() for s in sentences[:3] if s.strip()]
-        summary = ". ".join(summary_sentences).strip()
+        # Simple heuristic: take first 3 sentences, scanning only as far as needed
+        sentences = islice(_SENTENCE_RE.finditer(context), 3)
+        summary = " ".join(m.group().strip() for m in sentences)
 
         if not summary:
             return context[:200]
@@ -137,16 +159,15 @@ In summary, {self._extract_summary_from_context(context)}"""
         if not answer or not chunks:
             return False
 
-        # Simple validation: check if answer contains content from chunks
-        answer_lower = answer.lower()
+        # Simple validation: check if answer shares significant words with chunks
+        answer_words = set(_SIGNIFICANT_WORD_RE.findall(answer.lower()))
 
         for chunk in chunks:
-            content = chunk.get("content", "").lower()
-            # Check if any significant portion of chunk text appears in answer
-            words = content.split()
-            for word in words[:10]:  # Check first 10 words
-                if len(word) > 4 and word in answer_lower:
-                    return True
+            content = chunk.get("content", "")
+            # Check the first 10 significant words of each chunk
+            chunk_words = (m.group().lower() for m in _SIGNIFICANT_WORD_RE.finditer(content))
+            if not answer_words.isdisjoint(islice(chunk_words, 10)):
+                return True
 
         return False
 
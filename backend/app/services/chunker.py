@@ -2,45 +2,42 @@
 Text chunker - splits textbook content into manageable chunks
 """
 import logging
-from typing import List, Dict, Tuple
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from functools import partial
+from typing import List, Dict, Optional, Tuple
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Below this many pages, process pool startup costs more than it saves. Chunking
+# a page takes ~40us and shipping it to a worker and back costs nearly as much,
+# so the pool only pays off for very large documents
+_PARALLEL_MIN_PAGES = 1000
 
+
+@dataclass(slots=True)
 class TextChunk:
     """Represents a chunk of text with metadata"""
 
-    def __init__(
-        self,
-        chunk_id: int,
-        content: str,
-        page_number: int,
-        grade: str,
-        subject: str,
-        start_word_index: int,
-        end_word_index: int,
-    ):
-        self.chunk_id = chunk_id
-        self.content = content
-        self.page_number = page_number
-        self.grade = grade
-        self.subject = subject
-        self.start_word_index = start_word_index
-        self.end_word_index = end_word_index
-        self.word_count = len(content.split())
+    chunk_id: int
+    content: str
+    page_number: int
+    grade: str
+    subject: str
+    start_word_index: int
+    end_word_index: int
+    word_count: Optional[int] = None
+
+    def __post_init__(self):
+        # Chunker passes the count it already knows; only count words if it didn't
+        if self.word_count is None:
+            self.word_count = len(self.content.split())
 
     def to_dict(self) -> Dict:
         """Convert chunk to dictionary"""
-        return {
-            "chunk_id": self.chunk_id,
-            "content": self.content,
-            "page_number": self.page_number,
-            "grade": self.grade,
-            "subject": self.subject,
-            "start_word_index": self.start_word_index,
-            "end_word_index": self.end_word_index,
-            "word_count": self.word_count,
-        }
+        return asdict(self)
 
 
 class Chunker:
@@ -60,43 +57,81 @@ class Chunker:
         self.overlap_words = overlap_words
         self.chunk_counter = 0
 
-    def chunk_text(
-        self, text: str, page_number: int, grade: str, subject: str
-    ) -> List[TextChunk]:
+    def _chunk_bounds(self, text: str) -> List[Tuple[int, int, str]]:
         """
-        Chunk text into fixed-size blocks with metadata
+        Compute chunk boundaries for a text
 
         Args:
             text: Text to chunk
-            page_number: Page number for metadata
-            grade: Grade level for metadata
-            subject: Subject name for metadata
 
         Returns:
-            List of TextChunk objects
+            List of (start_word_index, end_word_index, content) tuples
         """
+        # str.split plus one join per chunk beats locating word offsets in
+        # `text` and slicing: both split and join run entirely in C
         words = text.split()
+        n_words = len(words)
 
-        if len(words) < self.min_words:
+        if n_words < self.min_words:
             logger.warning(
-                f"Text has {len(words)} words, below minimum {self.min_words}. "
+                f"Text has {n_words} words, below minimum {self.min_words}. "
                 f"Will create single chunk anyway."
             )
 
-        chunks = []
-        chunk_id = self.chunk_counter
+        bounds = []
         step = max(1, self.max_words - self.overlap_words)
 
-        for start_idx in range(0, len(words), step):
-            end_idx = min(start_idx + self.max_words, len(words))
+        for start_idx in range(0, n_words, step):
+            end_idx = min(start_idx + self.max_words, n_words)
 
             # Ensure minimum chunk size (except for the last chunk)
-            if end_idx - start_idx < self.min_words and end_idx < len(words):
+            if end_idx - start_idx < self.min_words and end_idx < n_words:
                 continue
 
-            chunk_words = words[start_idx:end_idx]
-            chunk_text = " ".join(chunk_words)
+            bounds.append((start_idx, end_idx, " ".join(words[start_idx:end_idx])))
+
+        if not bounds and n_words > 0:
+            # Create at least one chunk if text exists
+            bounds.append((0, n_words, text))
+
+        return bounds
+
+    def chunk_text(
+        self, text: str, page_number: int, grade: str, subject: str
+    ) -> List[TextChunk]:
+        """
+        Chunk text into fixed-size blocks with metadata
+
+        Args:
+            text: Text to chunk
+            page_number: Page number for metadata
+            grade: Grade level for metadata
+            subject: Subject name for metadata
+
+        Returns:
+            List of TextChunk objects
+        """
+        return self._build_chunks(self._chunk_bounds(text), page_number, grade, subject)
 
+    def _build_chunks(
+        self, bounds: List[Tuple[int, int, str]], page_number: int, grade: str, subject: str
+    ) -> List[TextChunk]:
+        """
+        Turn chunk boundaries into TextChunk objects with sequential IDs
+
+        Args:
+            bounds: List of (start_word_index, end_word_index, content) tuples
+            page_number: Page number for metadata
+            grade: Grade level for metadata
+            subject: Subject name for metadata
+
+        Returns:
+            List of TextChunk objects
+        """
+        chunks = []
+        chunk_id = self.chunk_counter
+
+        for start_idx, end_idx, chunk_text in bounds:
             chunk = TextChunk(
                 chunk_id=chunk_id,
                 content=chunk_text,
@@ -105,6 +140,7 @@ class Chunker:
                 subject=subject,
                 start_word_index=start_idx,
                 end_word_index=end_idx,
+                word_count=end_idx - start_idx,
             )
 
             chunks.append(chunk)
@@ -116,42 +152,81 @@ class Chunker:
                 f"Words: {chunk.word_count} | Grade: {grade} | Subject: {subject}"
             )
 
-        if not chunks and len(words) > 0:
-            # Create at least one chunk if text exists
-            chunk = TextChunk(
-                chunk_id=chunk_id,
-                content=text,
-                page_number=page_number,
-                grade=grade,
-                subject=subject,
-                start_word_index=0,
-                end_word_index=len(words),
-            )
-            chunks.append(chunk)
-            self.chunk_counter = chunk_id + 1
-
         return chunks
 
+    def chunk_text_batch(self, text: str, page_number: int) -> Dict:
+        """
+        Chunk text into a columnar layout for vectorized ingestion
+
+        Grade and subject are constant per page, so they are left to the caller.
+
+        Args:
+            text: Text to chunk
+            page_number: Page number for metadata
+
+        Returns:
+            Dictionary of NumPy arrays (chunk_id, page_number, start_word_index,
+            end_word_index) plus a "content" list of chunk strings
+        """
+        bounds = self._chunk_bounds(text)
+        n_chunks = len(bounds)
+
+        batch = {
+            "chunk_id": np.arange(self.chunk_counter, self.chunk_counter + n_chunks),
+            "page_number": np.full(n_chunks, page_number, dtype=np.int32),
+            "start_word_index": np.fromiter((b[0] for b in bounds), dtype=np.int32, count=n_chunks),
+            "end_word_index": np.fromiter((b[1] for b in bounds), dtype=np.int32, count=n_chunks),
+            "content": [b[2] for b in bounds],
+        }
+
+        self.chunk_counter += n_chunks
+
+        return batch
+
     def chunk_pages(
-        self, page_texts: Dict[int, str], grade: str, subject: str
+        self,
+        page_texts: Dict[int, str],
+        grade: str,
+        subject: str,
+        max_workers: Optional[int] = None,
     ) -> List[TextChunk]:
         """
         Chunk multiple pages
 
+        Pages are independent, so for larger documents they are chunked in a
+        process pool. Workers only return boundaries; chunk IDs are assigned
+        here in page order, so the result matches sequential chunking.
+
         Args:
             page_texts: Dictionary mapping page number to text
             grade: Grade level
             subject: Subject name
+            max_workers: Worker processes (default: CPU count; 1 disables the pool)
 
         Returns:
             List of all chunks
         """
+        page_numbers = sorted(page_texts.keys())
+        texts = [page_texts[page_num] for page_num in page_numbers]
+
+        max_workers = max_workers or os.cpu_count() or 1
+
+        if max_workers == 1 or len(texts) < _PARALLEL_MIN_PAGES:
+            page_bounds = [self._chunk_bounds(text) for text in texts]
+        else:
+            worker = partial(
+                _chunk_page_bounds,
+                min_words=self.min_words,
+                max_words=self.max_words,
+                overlap_words=self.overlap_words,
+            )
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                page_bounds = list(executor.map(worker, texts, chunksize=4))
+
         all_chunks = []
 
-        for page_num in sorted(page_texts.keys()):
-            text = page_texts[page_num]
-            page_chunks = self.chunk_text(text, page_num, grade, subject)
-            all_chunks.extend(page_chunks)
+        for page_num, bounds in zip(page_numbers, page_bounds):
+            all_chunks.extend(self._build_chunks(bounds, page_num, grade, subject))
 
         logger.info(
             f"Created {len(all_chunks)} chunks for {len(page_texts)} pages | "
@@ -163,3 +238,10 @@ class Chunker:
     def reset_counter(self):
         """Reset chunk counter (useful when processing new documents)"""
         self.chunk_counter = 0
+
+
+def _chunk_page_bounds(
+    text: str, min_words: int, max_words: int, overlap_words: int
+) -> List[Tuple[int, int, str]]:
+    """Compute chunk boundaries for one page (process pool worker)"""
+    return Chunker(min_words, max_words, overlap_words)._chunk_bounds(text)
@@ -2,8 +2,10 @@
 Guardrail - Safety mechanism to prevent out-of-syllabus answers
 """
 import logging
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, Optional, Tuple
+from app.services.prediction_cache import PredictionCache
 from app.services.syllabus_classifier import SyllabusClassifier
 from app import config
 
@@ -17,21 +19,105 @@ class Guardrail:
         """Initialize guardrail with pretrained Random Forest model"""
         self.classifier = SyllabusClassifier()
         self.model_loaded = False
+        # LRU cache of normalized question -> (prediction, confidence)
+        self._prediction_cache: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self.cache_size = config.GUARDRAIL_CACHE_SIZE
+        # Persistent cache shared across restarts (opened in load_model)
+        self._disk_cache: Optional[PredictionCache] = None
+
+    @staticmethod
+    def _normalize_question(question: str) -> str:
+        """
+        Normalize a question for cache lookups
+
+        The TF-IDF vectorizer lowercases and tokenizes on word boundaries, so
+        case and whitespace differences never change the prediction.
+        """
+        return " ".join(question.lower().split())
+
+    def _cache_get(self, key: str) -> Optional[Tuple[int, float]]:
+        """Look up a cached prediction in memory, then on disk"""
+        cached = self._prediction_cache.get(key)
+        if cached is not None:
+            self._prediction_cache.move_to_end(key)
+            return cached
+
+        if self._disk_cache is not None:
+            cached = self._disk_cache.get(key)
+            if cached is not None:
+                self._cache_put(key, cached)
+
+        return cached
+
+    def _cache_put(self, key: str, result: Tuple[int, float]) -> None:
+        """Store a prediction in memory, evicting the least recently used entry if full"""
+        self._prediction_cache[key] = result
+        if len(self._prediction_cache) > self.cache_size:
+            self._prediction_cache.popitem(last=False)
+
+    def _cache_store(self, results: Dict[str, Tuple[int, float]]) -> None:
+        """Store new predictions in memory and on disk"""
+        for key, result in results.items():
+            self._cache_put(key, result)
+
+        if self._disk_cache is not None:
+            self._disk_cache.put_many(results)
+
+    def _predict(self, question: str) -> Tuple[int, float]:
+        """Predict a single question, serving repeats from the cache"""
+        key = self._normalize_question(question)
+
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        result = self.classifier.predict(key)
+        self._cache_store({key: result})
+
+        return result
+
+    def clear_cache(self) -> None:
+        """Drop all cached predictions, in memory and on disk"""
+        self._prediction_cache.clear()
+        if self._disk_cache is not None:
+            self._disk_cache.clear()
+
+    def _open_disk_cache(self, model_path: Path) -> None:
+        """Open the persistent prediction cache, keyed to this model file"""
+        # A reload replaces the cache; close the old connection first
+        if self._disk_cache is not None:
+            self._disk_cache.close()
+            self._disk_cache = None
+
+        if config.PREDICTION_CACHE_PATH is None:
+            return
+
+        # Entries from a different (e.g. retrained) model are discarded, and
+        # never match since the namespace is part of every key
+        stat = model_path.stat()
+        namespace = f"{stat.st_size}-{stat.st_mtime_ns}"
+
+        try:
+            self._disk_cache = PredictionCache(str(config.PREDICTION_CACHE_PATH), namespace)
+        except Exception as e:
+            logger.warning(f"Prediction cache disabled: {e}")
+            self._disk_cache = None
 
     def load_model(self) -> None:
         """Load the trained Random Forest classifier from disk"""
-        classifier_path = config.CLASSIFIER_MODEL_PATH
-        vectorizer_path = config.VECTORIZER_MODEL_PATH
+        model_path = config.GUARDRAIL_MODEL_PATH
 
-        if not Path(classifier_path).exists() or not Path(vectorizer_path).exists():
+        if not Path(model_path).exists():
             logger.warning(
-                f"Model files not found at {classifier_path} or {vectorizer_path}. "
+                f"Model file not found at {model_path}. "
                 "Please train the model first using train_guardrail_model()."
             )
             return
 
         try:
-            self.classifier.load(str(classifier_path), str(vectorizer_path))
+            self.classifier.load(str(model_path))
+            self._prediction_cache.clear()
+            self._open_disk_cache(Path(model_path))
             self.model_loaded = True
             logger.info("Guardrail model loaded successfully")
         except Exception as e:
@@ -58,7 +144,7 @@ class Guardrail:
         if confidence_threshold is None:
             confidence_threshold = config.SYLLABUS_CONFIDENCE_THRESHOLD
 
-        prediction, confidence = self.classifier.predict(question)
+        prediction, confidence = self._predict(question)
 
         # Convert prediction (1/0) to boolean (in_syllabus)
         is_in_syllabus = bool(prediction == 1)
@@ -81,13 +167,27 @@ class Guardrail:
         if not self.model_loaded:
             raise RuntimeError("Guardrail model not loaded")
 
-        predictions, confidences = self.classifier.predict_batch(questions)
-
         if confidence_threshold is None:
             confidence_threshold = config.SYLLABUS_CONFIDENCE_THRESHOLD
 
+        keys = [self._normalize_question(q) for q in questions]
+        predictions = {}
+        for key in keys:
+            cached = self._cache_get(key)
+            if cached is not None:
+                predictions[key] = cached
+
+        # Classify all cache misses with one predict_batch call
+        misses = list(dict.fromkeys(key for key in keys if key not in predictions))
+        if misses:
+            miss_preds, miss_confs = self.classifier.predict_batch(misses)
+            new_predictions = dict(zip(misses, zip(miss_preds, miss_confs)))
+            predictions.update(new_predictions)
+            self._cache_store(new_predictions)
+
         results = []
-        for pred, conf in zip(predictions, confidences):
+        for key in keys:
+            pred, conf = predictions[key]
             is_in_syllabus = bool(pred == 1)
             results.append((is_in_syllabus, conf))
 
@@ -0,0 +1,143 @@
+"""
+Guardrail batcher - coalesces concurrent guardrail checks into batch predictions
+"""
+import asyncio
+import logging
+from typing import List, Optional, Tuple
+from app.services.guardrail import Guardrail
+from app import config
+
+logger = logging.getLogger(__name__)
+
+# Queued by stop() behind any pending questions to end the consumer loop
+_STOP = object()
+
+
+class GuardrailBatcher:
+    """Collects questions from concurrent requests and classifies them together"""
+
+    def __init__(
+        self,
+        guardrail: Guardrail,
+        max_batch_size: int = config.GUARDRAIL_BATCH_MAX_SIZE,
+        max_wait_ms: float = config.GUARDRAIL_BATCH_WAIT_MS,
+    ):
+        """
+        Initialize batcher
+
+        Args:
+            guardrail: Guardrail used to classify each batch
+            max_batch_size: Maximum questions per batch
+            max_wait_ms: How long to wait for more questions after the first one
+        """
+        self.guardrail = guardrail
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the consumer task (must be called from the running event loop)"""
+        if self._worker is not None:
+            return
+
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+        logger.info(
+            f"Guardrail batcher started | Max batch: {self.max_batch_size} | "
+            f"Window: {self.max_wait * 1000:.0f}ms"
+        )
+
+    async def stop(self) -> None:
+        """Stop the consumer task once every question already queued is answered"""
+        if self._worker is None:
+            return
+
+        worker, queue = self._worker, self._queue
+
+        # New questions go straight to the guardrail from here on
+        self._worker = None
+        await queue.put(_STOP)
+        await worker
+
+        self._queue = None
+
+    async def is_in_syllabus(self, question: str) -> Tuple[bool, float]:
+        """
+        Check a question, batched with any others arriving in the same window
+
+        Falls back to a direct guardrail call when the batcher isn't running.
+
+        Args:
+            question: Question text to check
+
+        Returns:
+            Tuple of (is_in_syllabus, confidence)
+        """
+        if self._worker is None:
+            return self.guardrail.is_in_syllabus(question)
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((question, future))
+        return await future
+
+    async def _collect_batch(self) -> Tuple[List[Tuple[str, asyncio.Future]], bool]:
+        """
+        Wait for one question, then gather more until the window closes or the batch is full
+
+        Returns:
+            Tuple of (batch, stopping), where stopping is True once stop() was requested
+        """
+        loop = asyncio.get_running_loop()
+
+        item = await self._queue.get()
+        if item is _STOP:
+            return [], True
+
+        batch = [item]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+
+        return batch, False
+
+    async def _run(self) -> None:
+        """
+        Consumer loop: classify each collected batch with one batch_check call
+
+        batch_check runs in a worker thread, since it does blocking SQLite
+        reads/writes (prediction cache) and CPU-bound prediction. Batches are
+        still handled one at a time, so the guardrail is never called
+        concurrently from here. Returns after answering the batch in which
+        stop() was requested.
+        """
+        stopping = False
+
+        while not stopping:
+            batch, stopping = await self._collect_batch()
+            if not batch:
+                continue
+
+            try:
+                results = await asyncio.to_thread(
+                    self.guardrail.batch_check, [question for question, _ in batch]
+                )
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
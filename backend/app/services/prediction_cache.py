@@ -0,0 +1,118 @@
+"""
+Prediction cache - persists guardrail predictions on disk across restarts
+"""
+import hashlib
+import logging
+import sqlite3
+import struct
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# uint8 prediction + float64 confidence
+_PAYLOAD = struct.Struct("<Bd")
+
+
+class PredictionCache:
+    """SQLite-backed key/value cache of (prediction, confidence) per question"""
+
+    def __init__(self, path: str, namespace: str):
+        """
+        Open (or create) the cache
+
+        Args:
+            path: Path to the SQLite database file
+            namespace: Identifies the model the entries belong to; if it differs
+                from the stored one, existing entries are dropped. It is also
+                hashed into every key, so entries written by another model (e.g.
+                an old worker during a rolling restart) are never served
+        """
+        self.path = Path(path)
+        self.namespace = namespace
+        # Keys hash the namespace first; copy() reuses that prefix per question
+        self._key_hash = hashlib.blake2b(namespace.encode("utf-8") + b"\0", digest_size=8)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=5, isolation_level=None, check_same_thread=False
+        )
+
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS predictions (key INTEGER PRIMARY KEY, value BLOB NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+
+            row = self._conn.execute("SELECT value FROM meta WHERE name = 'namespace'").fetchone()
+            if row is None or row[0] != namespace:
+                self._conn.execute("DELETE FROM predictions")
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (name, value) VALUES ('namespace', ?)", (namespace,)
+                )
+                logger.info(f"Prediction cache reset for model {namespace}")
+
+    def make_key(self, question: str) -> int:
+        """
+        Hash the namespace and a normalized question to a stable 64-bit key
+
+        Python's built-in hash() is salted per process, so it can't be used
+        for keys that must survive restarts.
+        """
+        key_hash = self._key_hash.copy()
+        key_hash.update(question.encode("utf-8"))
+        return int.from_bytes(key_hash.digest(), "big", signed=True)
+
+    def get(self, question: str) -> Optional[Tuple[int, float]]:
+        """
+        Look up a cached prediction
+
+        Args:
+            question: Normalized question text
+
+        Returns:
+            (prediction, confidence) or None if not cached
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT value FROM predictions WHERE key = ?", (self.make_key(question),)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Prediction cache read failed: {e}")
+            return None
+
+        return _PAYLOAD.unpack(row[0]) if row else None
+
+    def put_many(self, results: Dict[str, Tuple[int, float]]) -> None:
+        """
+        Store predictions
+
+        Args:
+            results: Mapping of normalized question to (prediction, confidence)
+        """
+        rows: Iterable = (
+            (self.make_key(question), _PAYLOAD.pack(pred, conf))
+            for question, (pred, conf) in results.items()
+        )
+        try:
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO predictions (key, value) VALUES (?, ?)", rows
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Prediction cache write failed: {e}")
+
+    def clear(self) -> None:
+        """Remove all cached predictions"""
+        with self._lock:
+            self._conn.execute("DELETE FROM predictions")
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -2,27 +2,100 @@
 Syllabus classifier - Random Forest model for checking if questions are in-syllabus
 """
 import logging
-from typing import Tuple
+import re
+from typing import Callable, Optional, Tuple, Union
 import numpy as np
 import joblib
+import scipy.sparse as sp
+from sklearn.base import clone
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, CountVectorizer, TfidfVectorizer
+from sklearn.utils.sparsefuncs_fast import inplace_csr_row_normalize_l2
+
+try:
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+except ImportError:
+    convert_sklearn = None
+
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
 
 logger = logging.getLogger(__name__)
 
+# Same pattern as TfidfVectorizer's default token_pattern, compiled once
+_TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
+
+# Batches larger than this predict with all cores; smaller ones stay single-threaded
+_PARALLEL_BATCH_SIZE = 512
+
+
+def _analyze(text: str) -> list:
+    """
+    Split a question into TF-IDF terms: lowercased unigrams and bigrams
+    with English stop words removed
+
+    Produces the same terms as TfidfVectorizer's word analyzer with
+    lowercase=True, stop_words="english" and ngram_range=(1, 2), without the
+    chain of preprocessor/tokenizer/n-gram calls it makes per document.
+
+    Args:
+        text: Question text
+
+    Returns:
+        Unigrams followed by bigrams
+    """
+    tokens = [token for token in _TOKEN_RE.findall(text.lower()) if token not in ENGLISH_STOP_WORDS]
+    return tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]
+
+
+def _prepare_idf_diag(vectorizer: TfidfVectorizer) -> None:
+    """
+    Store a fitted vectorizer's IDF diagonal as CSR in the vectorizer's dtype
+
+    transform() multiplies every batch by this matrix. In any other sparse
+    format scipy converts it to CSR on each call, and the idf_ setter always
+    stores float64 weights, which would upcast every transformed matrix.
+
+    This is a private sklearn detail (releases after 1.3 keep no diagonal and
+    scale by idf_ directly), so it is skipped when the attribute is missing.
+    """
+    tfidf = getattr(vectorizer, "_tfidf", None)
+    idf_diag = getattr(tfidf, "_idf_diag", None)
+    if idf_diag is None:
+        return
+
+    if not sp.isspmatrix_csr(idf_diag) or idf_diag.dtype != vectorizer.dtype:
+        tfidf._idf_diag = sp.csr_matrix(idf_diag, dtype=vectorizer.dtype)
+
+
+def _is_compressed(path: str) -> bool:
+    """
+    Check whether a joblib file was written with compression
+
+    Uncompressed joblib files are plain pickles and start with the pickle
+    PROTO opcode; none of joblib's compressors use that byte as a magic.
+    """
+    with open(path, "rb") as f:
+        return f.read(1) != b"\x80"
+
 
 class SyllabusClassifier:
     """Random Forest classifier for binary classification (in-syllabus vs out-of-syllabus)"""
 
     def __init__(
         self,
-        n_estimators: int = 100,
-        max_depth: int = 20,
+        n_estimators: int = 30,
+        max_depth: int = 10,
         min_samples_split: int = 5,
         min_samples_leaf: int = 2,
         tfidf_max_features: int = 5000,
         tfidf_min_df: int = 2,
         tfidf_max_df: float = 0.8,
+        tfidf_dtype: type = np.float32,
+        rf_n_jobs: int = -1,
     ):
         """
         Initialize classifier with hyperparameters
@@ -35,26 +108,47 @@ class SyllabusClassifier:
             tfidf_max_features: Max features for TF-IDF
             tfidf_min_df: Min document frequency for TF-IDF
             tfidf_max_df: Max document frequency for TF-IDF
+            tfidf_dtype: Dtype of TF-IDF matrices (float32 halves their memory;
+                the forest converts its input to float32 anyway)
+            rf_n_jobs: Parallel jobs for fitting the forest and for large batch
+                predictions (-1 uses all cores; other predictions use one job)
         """
         self.tfidf_vectorizer = TfidfVectorizer(
             max_features=tfidf_max_features,
             min_df=tfidf_min_df,
             max_df=tfidf_max_df,
-            ngram_range=(1, 2),
-            lowercase=True,
-            stop_words="english",
+            analyzer=_analyze,
+            lowercase=False,
+            dtype=tfidf_dtype,
         )
 
+        self.rf_n_jobs = rf_n_jobs
+
+        # Fitted IDF weights as a flat array (see _transform)
+        self._idf: Optional[np.ndarray] = None
+
+        # Single-question predictor, compiled on first predict() (see compile_fast_predict)
+        self._fast_predict: Optional[Callable[[str], Tuple[int, float]]] = None
+
         self.classifier = RandomForestClassifier(
             n_estimators=n_estimators,
             max_depth=max_depth,
             min_samples_split=min_samples_split,
             min_samples_leaf=min_samples_leaf,
             random_state=42,
-            n_jobs=-1,
+            n_jobs=rf_n_jobs,
             verbose=0,
         )
 
+        # TF-IDF rows and labels the forest was fitted on, kept for warm-start
+        # retraining (see retrain)
+        self._train_X: Optional[sp.csr_matrix] = None
+        self._train_labels: Optional[np.ndarray] = None
+
+        # Compiled ONNX copy of the forest (optional, see _export_onnx)
+        self._onnx_model: Optional[bytes] = None
+        self._onnx_session = None
+
         self.is_trained = False
 
     def train(self, questions: list, labels: list) -> None:
@@ -78,11 +172,21 @@ class SyllabusClassifier:
 
         # Fit TF-IDF vectorizer and transform questions
         X = self.tfidf_vectorizer.fit_transform(questions)
+        self._cache_idf()
+
+        # Train Random Forest in parallel, but predict single rows without
+        # joblib dispatch overhead
+        self.classifier.n_jobs = self.rf_n_jobs
+        try:
+            self.classifier.fit(X, labels)
+        finally:
+            self.classifier.n_jobs = 1
 
-        # Train Random Forest
-        self.classifier.fit(X, labels)
+        self._train_X = X
+        self._train_labels = np.asarray(labels)
 
         self.is_trained = True
+        self._export_onnx(X.shape[1])
 
         # Log class distribution
         unique, counts = np.unique(labels, return_counts=True)
@@ -90,6 +194,80 @@ class SyllabusClassifier:
             label_name = "In-Syllabus" if label == 1 else "Out-of-Syllabus"
             logger.info(f"{label_name}: {count} samples ({100*count/len(labels):.1f}%)")
 
+    def retrain(self, questions: list, labels: list, n_new_estimators: int = 10) -> None:
+        """
+        Add new training samples and grow the forest without refitting it
+
+        Only the new questions are vectorized; they are stacked under the
+        cached TF-IDF rows from the last training run, and n_new_estimators
+        trees are fitted on the combined data while the existing trees are
+        kept (warm start). The vocabulary is not refitted, so terms that only
+        appear in the new questions are ignored until the next full train().
+
+        Args:
+            questions: List of new question texts
+            labels: List of binary labels for the new questions
+            n_new_estimators: Number of trees to add to the forest
+        """
+        if not self.is_trained:
+            raise RuntimeError("Classifier must be trained before it can be retrained")
+
+        if self._train_X is None:
+            raise RuntimeError(
+                "No cached training matrix; call train() or load_training_matrix() first"
+            )
+
+        if len(questions) != len(labels):
+            raise ValueError("Number of questions must match number of labels")
+
+        X = sp.vstack([self._train_X, self._transform(questions)], format="csr")
+        y = np.concatenate([self._train_labels, np.asarray(labels)])
+
+        logger.info(
+            f"Retraining classifier with {len(questions)} new samples "
+            f"({X.shape[0]} total), adding {n_new_estimators} trees"
+        )
+
+        self.classifier.set_params(
+            warm_start=True,
+            n_estimators=self.classifier.n_estimators + n_new_estimators,
+            n_jobs=self.rf_n_jobs,
+        )
+        try:
+            self.classifier.fit(X, y)
+        finally:
+            self.classifier.set_params(warm_start=False, n_jobs=1)
+
+        self._train_X = X
+        self._train_labels = y
+        self._export_onnx(X.shape[1])
+
+    def save_training_matrix(self, matrix_path: str) -> None:
+        """
+        Save the cached TF-IDF training matrix and labels for later retraining
+
+        Args:
+            matrix_path: Path to save the matrix/labels bundle
+        """
+        if self._train_X is None:
+            logger.warning("No training matrix to save")
+            return
+
+        joblib.dump({"X": self._train_X, "labels": self._train_labels}, matrix_path)
+        logger.info(f"Saved training matrix {self._train_X.shape} to {matrix_path}")
+
+    def load_training_matrix(self, matrix_path: str) -> None:
+        """
+        Load a TF-IDF training matrix saved by save_training_matrix
+
+        Args:
+            matrix_path: Path to the matrix/labels bundle
+        """
+        data = joblib.load(matrix_path)
+        self._train_X = data["X"]
+        self._train_labels = data["labels"]
+        logger.info(f"Loaded training matrix {self._train_X.shape} from {matrix_path}")
+
     def predict(self, question: str) -> Tuple[int, float]:
         """
         Predict if question is in-syllabus
@@ -105,14 +283,65 @@ class SyllabusClassifier:
         if not self.is_trained:
             raise RuntimeError("Classifier must be trained before making predictions")
 
-        X = self.tfidf_vectorizer.transform([question])
-        prediction = self.classifier.predict(X)[0]
-        probabilities = self.classifier.predict_proba(X)[0]
+        if self._fast_predict is None:
+            self._fast_predict = self.compile_fast_predict()
+
+        return self._fast_predict(question)
+
+    def compile_fast_predict(self) -> Callable[[str], Tuple[int, float]]:
+        """
+        Build a predictor specialised for one question at a time
+
+        The returned function looks the question's terms up in the frozen
+        vocabulary and writes their TF-IDF weights straight into a dense
+        feature row, skipping CountVectorizer and the sparse matrix it builds.
+        Results are identical to predict_batch. Vectorizers this shortcut
+        does not cover (e.g. pickled ones from older bundles) get a function
+        that uses the generic path.
+
+        Returns:
+            Function mapping a question to (prediction, confidence)
+        """
+        if not self.is_trained:
+            raise RuntimeError("Classifier must be trained before making predictions")
+
+        vectorizer = self.tfidf_vectorizer
+
+        if (
+            self._idf is None
+            or vectorizer.analyzer is not _analyze
+            or not vectorizer.use_idf
+            or vectorizer.sublinear_tf
+            or vectorizer.norm != "l2"
+        ):
+            def predict_generic(question: str) -> Tuple[int, float]:
+                predictions, confidences = self._predict_matrix(self._transform([question]))
+                return int(predictions[0]), float(confidences[0])
 
-        # Get confidence for the predicted class
-        confidence = probabilities[prediction]
+            return predict_generic
 
-        return int(prediction), float(confidence)
+        vocabulary = vectorizer.vocabulary_
+        idf = self._idf
+        n_features = len(idf)
+        dtype = vectorizer.dtype
+
+        def predict_fast(question: str) -> Tuple[int, float]:
+            X = np.zeros((1, n_features), dtype=dtype)
+            row = X[0]
+            for term in _analyze(question):
+                index = vocabulary.get(term)
+                if index is not None:
+                    row[index] += 1
+
+            nonzero = row.nonzero()[0]
+            if len(nonzero):
+                row[nonzero] *= idf[nonzero]
+                row /= np.sqrt(np.dot(row[nonzero], row[nonzero]))
+
+            predictions, confidences = self._predict_matrix(X)
+            return int(predictions[0]), float(confidences[0])
+
+        return predict_fast
 
     def predict_batch(self, questions: list) -> Tuple[list, list]:
         """
@@ -127,54 +356,239 @@ class SyllabusClassifier:
         if not self.is_trained:
             raise RuntimeError("Classifier must be trained before making predictions")
 
-        predictions = []
-        confidences = []
+        if not questions:
+            return [], []
+
+        X = self._transform(questions)
+
+        # One forest call for the whole batch; only large batches are worth
+        # paying joblib's dispatch overhead for
+        if len(questions) > _PARALLEL_BATCH_SIZE:
+            self.classifier.n_jobs = self.rf_n_jobs
+            try:
+                predictions, confidences = self._predict_matrix(X)
+            finally:
+                self.classifier.n_jobs = 1
+        else:
+            predictions, confidences = self._predict_matrix(X)
+
+        return predictions.tolist(), confidences.tolist()
+
+    def _cache_idf(self) -> None:
+        """Normalize the fitted IDF diagonal and keep its weights as an array"""
+        _prepare_idf_diag(self.tfidf_vectorizer)
+        self._idf = self.tfidf_vectorizer.idf_.astype(self.tfidf_vectorizer.dtype)
+        # The compiled predictor captures the old vocabulary and weights
+        self._fast_predict = None
+
+    def _transform(self, questions: list) -> sp.csr_matrix:
+        """
+        TF-IDF transform for prediction
+
+        Same result as tfidf_vectorizer.transform, but the IDF weights are
+        applied to the count matrix's data array and rows are L2-normalized
+        in place, skipping the sparse product with the IDF diagonal and
+        sklearn's per-call validation (the bulk of the cost for one question).
+
+        Args:
+            questions: List of question texts
+
+        Returns:
+            TF-IDF matrix (one row per question)
+        """
+        vectorizer = self.tfidf_vectorizer
+
+        if (
+            self._idf is None
+            or not vectorizer.use_idf
+            or vectorizer.sublinear_tf
+            or vectorizer.norm != "l2"
+        ):
+            return vectorizer.transform(questions)
+
+        X = CountVectorizer.transform(vectorizer, questions)
+        X.data *= self._idf[X.indices]
+        inplace_csr_row_normalize_l2(X)
+
+        return X
+
+    def _predict_matrix(self, X) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Predict classes and confidences for a TF-IDF matrix
+
+        Args:
+            X: TF-IDF feature matrix (one row per question), sparse or dense
 
-        for question in questions:
-            pred, conf = self.predict(question)
-            predictions.append(pred)
-            confidences.append(conf)
+        Returns:
+            Tuple of (predictions, confidences) arrays
+        """
+        if self._onnx_session is not None:
+            dense = X.toarray() if sp.issparse(X) else X
+            probabilities = self._onnx_session.run(
+                ["probabilities"], {"input": dense.astype(np.float32, copy=False)}
+            )[0]
+        else:
+            # predict() is argmax over predict_proba, so a single call gives both
+            probabilities = self.classifier.predict_proba(X)
+        best = probabilities.argmax(axis=1)
+
+        predictions = self.classifier.classes_[best].astype(int)
+        confidences = probabilities[np.arange(len(best)), best]
 
         return predictions, confidences
 
-    def save(self, classifier_path: str, vectorizer_path: str) -> None:
+    def _export_onnx(self, n_features: int) -> None:
+        """
+        Convert the trained forest to ONNX for faster per-request inference
+
+        Skipped when skl2onnx is not installed; predictions then use sklearn.
+
+        Args:
+            n_features: Number of TF-IDF features the forest was trained on
+        """
+        self._onnx_model = None
+        self._onnx_session = None
+
+        if convert_sklearn is None:
+            return
+
+        try:
+            onnx_model = convert_sklearn(
+                self.classifier,
+                initial_types=[("input", FloatTensorType([None, n_features]))],
+                options={id(self.classifier): {"zipmap": False}},
+            )
+            self._onnx_model = onnx_model.SerializeToString()
+            self._start_onnx_session()
+        except Exception as e:
+            logger.warning(f"ONNX export failed, using sklearn for inference: {e}")
+            self._onnx_model = None
+
+    def _start_onnx_session(self) -> None:
+        """Create an onnxruntime session for the exported forest, if available"""
+        self._onnx_session = None
+
+        if self._onnx_model is None or onnxruntime is None:
+            return
+
+        # One thread keeps single-request latency low
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = 1
+
+        try:
+            self._onnx_session = onnxruntime.InferenceSession(
+                self._onnx_model,
+                sess_options=options,
+                providers=["CPUExecutionProvider"],
+            )
+        except Exception as e:
+            logger.warning(f"ONNX runtime unavailable, using sklearn for inference: {e}")
+
+    def save(self, model_path: str, compress: Union[int, Tuple[str, int]] = 0) -> None:
         """
-        Save model and vectorizer to disk
+        Save model and vectorizer to disk as a single joblib artifact
+
+        Only the fitted vectorizer state is stored - its terms (in feature
+        order) and IDF weights as plain arrays - rather than the pickled
+        vectorizer, which also carries the large stop_words_ set.
+
+        Compression shrinks the artifact (mostly the forest's node arrays),
+        but joblib cannot memory-map a compressed file, so load() then reads
+        it fully into memory.
 
         Args:
-            classifier_path: Path to save classifier
-            vectorizer_path: Path to save vectorizer
+            model_path: Path to save the combined classifier/vectorizer bundle
+            compress: joblib compression - 0 for none, a zlib level (e.g. 3)
+                or a (method, level) tuple such as ("lz4", 3)
         """
         if not self.is_trained:
             logger.warning("Saving untrained model")
 
         try:
-            joblib.dump(self.classifier, classifier_path)
-            joblib.dump(self.tfidf_vectorizer, vectorizer_path)
-            logger.info(f"Saved classifier to {classifier_path}")
-            logger.info(f"Saved vectorizer to {vectorizer_path}")
+            joblib.dump(
+                {
+                    "classifier": self.classifier,
+                    "terms": self._feature_terms().astype(str),
+                    "idf": self.tfidf_vectorizer.idf_,
+                    "onnx": self._onnx_model,
+                },
+                model_path,
+                compress=compress,
+            )
+            logger.info(f"Saved classifier and vectorizer to {model_path}")
         except Exception as e:
             logger.error(f"Failed to save model: {e}")
             raise
 
-    def load(self, classifier_path: str, vectorizer_path: str) -> None:
+    def load(self, model_path: str, mmap_mode: Optional[str] = "r") -> None:
         """
         Load model and vectorizer from disk
 
+        NumPy arrays inside the bundle are memory-mapped by default, so the OS
+        page cache can share them across worker processes. Compressed bundles
+        cannot be memory-mapped and are read into memory instead.
+
         Args:
-            classifier_path: Path to classifier
-            vectorizer_path: Path to vectorizer
+            model_path: Path to the combined classifier/vectorizer bundle
+            mmap_mode: joblib mmap mode for NumPy arrays (None to read into memory)
         """
         try:
-            self.classifier = joblib.load(classifier_path)
-            self.tfidf_vectorizer = joblib.load(vectorizer_path)
+            if mmap_mode is not None and _is_compressed(model_path):
+                # joblib only warns that it ignores mmap_mode here, but the
+                # forest's node arrays come back corrupted if it is passed
+                mmap_mode = None
+            bundle = joblib.load(model_path, mmap_mode=mmap_mode)
+            self.classifier = bundle["classifier"]
+            if "vectorizer" in bundle:
+                # Bundle from before vocabulary-only saving
+                self.tfidf_vectorizer = bundle["vectorizer"]
+            else:
+                self.tfidf_vectorizer = self._restore_vectorizer(bundle["terms"], bundle["idf"])
+            self._cache_idf()
+            # Bundles saved before training reset n_jobs still carry n_jobs=-1
+            self.classifier.n_jobs = 1
+            self._onnx_model = bundle.get("onnx")
+            self._start_onnx_session()
             self.is_trained = True
-            logger.info(f"Loaded classifier from {classifier_path}")
-            logger.info(f"Loaded vectorizer from {vectorizer_path}")
+            logger.info(f"Loaded classifier and vectorizer from {model_path}")
         except Exception as e:
             logger.error(f"Failed to load model: {e}")
             raise
 
+    def _feature_terms(self) -> np.ndarray:
+        """
+        Get the vocabulary terms indexed by feature
+
+        Same result as get_feature_names_out(), but filled in one pass over
+        the vocabulary instead of sorting all of its items.
+
+        Returns:
+            Object array of terms in feature order
+        """
+        vocabulary = self.tfidf_vectorizer.vocabulary_
+        terms = np.empty(len(vocabulary), dtype=object)
+        for term, index in vocabulary.items():
+            terms[index] = term
+
+        return terms
+
+    def _restore_vectorizer(self, terms: np.ndarray, idf: np.ndarray) -> TfidfVectorizer:
+        """
+        Rebuild a fitted TF-IDF vectorizer from saved terms and IDF weights
+
+        Args:
+            terms: Vocabulary terms, indexed by feature
+            idf: IDF weight per feature
+
+        Returns:
+            Vectorizer with this instance's settings and the saved vocabulary
+        """
+        vectorizer = clone(self.tfidf_vectorizer)
+        vectorizer.vocabulary_ = {term: index for index, term in enumerate(terms.tolist())}
+        vectorizer.idf_ = idf
+
+        return vectorizer
+
     def get_feature_importance(self, top_n: int = 20) -> list:
         """
         Get top N most important features
@@ -189,8 +603,13 @@ class SyllabusClassifier:
             raise RuntimeError("Classifier must be trained to get feature importance")
 
         importances = self.classifier.feature_importances_
-        feature_names = self.tfidf_vectorizer.get_feature_names_out()
 
-        top_indices = np.argsort(importances)[-top_n:][::-1]
+        top_n = min(top_n, len(importances))
+        if top_n <= 0:
+            return []
+
+        # Select the top N in linear time, then sort only those
+        top_indices = np.argpartition(importances, -top_n)[-top_n:]
+        top_indices = top_indices[np.argsort(-importances[top_indices], kind="stable")]
 
-        return [(feature_names[i], importances[i]) for i in top_indices]
+        return list(zip(self._feature_terms()[top_indices].tolist(), importances[top_indices].tolist()))
@@ -2,28 +2,197 @@
 Textbook loader - extracts text from PDF files
 """
 import logging
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 import pdfplumber
+from app import config
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
 
 logger = logging.getLogger(__name__)
 
+# Below this many pages, process start-up costs more than parallel extraction saves
+_PARALLEL_MIN_PAGES = 64
+
+PDF_BACKENDS = ("pdfplumber", "pdfium")
+
+# Page counts keyed by file version (see _file_version), least recently used first
+_PAGE_COUNT_CACHE_SIZE = 32
+_page_counts: "OrderedDict[Tuple[Path, int, int], int]" = OrderedDict()
+
+
+def _pdfium_page_text(pdf, index: int) -> str:
+    """Extract the text of one page with PDFium"""
+    page = pdf[index]
+    try:
+        textpage = page.get_textpage()
+        try:
+            # Image-only (e.g. scanned) pages have no text layer
+            if textpage.count_chars() == 0:
+                return ""
+            return textpage.get_text_range()
+        finally:
+            textpage.close()
+    finally:
+        page.close()
+
+
+def _pdfplumber_page_text(pdf, index: int) -> str:
+    """Extract the text of one page with pdfplumber"""
+    page = pdf.pages[index]
+    try:
+        # Skip layout analysis for image-only (e.g. scanned) pages
+        if not page.chars:
+            return ""
+        return page.extract_text()
+    finally:
+        # The open PDF keeps every page it has handed out, so drop this page's
+        # cached layout objects (same as Page.close(), which pdfplumber 0.10 lacks)
+        page.flush_cache()
+        page.get_textmap.cache_clear()
+
+
+@contextmanager
+def _open_pdf(pdf_path: Path, backend: str) -> Iterator[Tuple[int, Callable[[int], str]]]:
+    """
+    Open a PDF with the given backend
+
+    Yields:
+        Tuple of (page_count, extract_page) where extract_page takes a
+        zero-based page index and returns that page's raw text
+    """
+    if backend == "pdfium":
+        pdf = pdfium.PdfDocument(str(pdf_path))
+        try:
+            yield len(pdf), lambda index: _pdfium_page_text(pdf, index)
+        finally:
+            pdf.close()
+    elif backend == "pdfplumber":
+        with pdfplumber.open(pdf_path) as pdf:
+            yield len(pdf.pages), lambda index: _pdfplumber_page_text(pdf, index)
+    else:
+        raise ValueError(f"Unknown PDF backend: {backend}. Supported: {PDF_BACKENDS}")
+
+
+def _file_version(pdf_path: Path) -> Tuple[Path, int, int]:
+    """
+    Identify a file's current contents by resolved path, mtime and size
+
+    Used as the page count cache key, so a rebuilt or replaced textbook is
+    re-read instead of served from the cache.
+    """
+    stat = pdf_path.stat()
+    return pdf_path.resolve(), stat.st_mtime_ns, stat.st_size
+
+
+def _remember_page_count(version: Tuple[Path, int, int], page_count: int) -> None:
+    """Cache a page count, evicting the least recently used entry when full"""
+    _page_counts[version] = page_count
+    _page_counts.move_to_end(version)
+
+    while len(_page_counts) > _PAGE_COUNT_CACHE_SIZE:
+        _page_counts.popitem(last=False)
+
+
+def _iter_page_range(
+    pdf_path: Path, backend: str, start: int = 1, end: Optional[int] = None
+) -> Iterator[Tuple[int, str]]:
+    """
+    Extract and clean pages start..end-1 (1-based; end defaults to the last page)
+
+    Yields:
+        Tuple of (page_number, text), one page at a time
+    """
+    with _open_pdf(pdf_path, backend) as (total_pages, extract_page):
+        yield from _extract_pages(extract_page, start, total_pages + 1 if end is None else end)
+
+
+def _extract_pages(
+    extract_page: Callable[[int], str], start: int, end: int
+) -> Iterator[Tuple[int, str]]:
+    """
+    Extract and clean pages start..end-1 (1-based) from an open document
+
+    Yields:
+        Tuple of (page_number, text), one page at a time
+    """
+    for page_num in range(start, end):
+        try:
+            text = extract_page(page_num - 1)
+            if text:
+                # Clean up text
+                text = TextbookLoader._clean_text(text)
+                logger.debug(f"Extracted {len(text)} characters from page {page_num}")
+            else:
+                logger.warning(f"No text extracted from page {page_num}")
+                text = ""
+
+        except Exception as e:
+            logger.error(f"Error extracting text from page {page_num}: {e}")
+            text = ""
+
+        yield page_num, text
+
+
+def _extract_page_range(pdf_path: Path, backend: str, start: int, end: int) -> Dict[int, str]:
+    """
+    Extract and clean pages start..end-1 (1-based)
+
+    Module-level so it can run in a worker process; each call opens its own
+    document handle, since parser objects cannot be shared across processes.
+    """
+    return dict(_iter_page_range(pdf_path, backend, start, end))
+
 
 class TextbookLoader:
     """Loads and extracts text from PDF textbooks"""
 
-    def __init__(self):
-        """Initialize the textbook loader"""
+    def __init__(self, pdf_backend: Optional[str] = None):
+        """
+        Initialize the textbook loader
+
+        Args:
+            pdf_backend: "pdfplumber" or "pdfium" (defaults to config.PDF_BACKEND)
+
+        Raises:
+            ValueError: If the backend is not one of PDF_BACKENDS
+        """
         self.loaded_textbooks = {}
+        self.pdf_backend = pdf_backend or config.PDF_BACKEND
+
+        if self.pdf_backend not in PDF_BACKENDS:
+            raise ValueError(f"Unknown PDF backend: {self.pdf_backend}. Supported: {PDF_BACKENDS}")
 
-    def load_pdf(self, pdf_path: str, grade: str, subject: str) -> Dict[int, str]:
+        if self.pdf_backend == "pdfium" and pdfium is None:
+            logger.warning("pypdfium2 not installed, falling back to pdfplumber")
+            self.pdf_backend = "pdfplumber"
+
+    def load_pdf(
+        self,
+        pdf_path: str,
+        grade: str,
+        subject: str,
+        max_workers: Optional[int] = None,
+    ) -> Dict[int, str]:
         """
         Load a PDF file and extract text by page
 
+        Pages are independent, so larger documents are split into one page
+        range per worker and extracted in a process pool.
+
         Args:
             pdf_path: Path to the PDF file
             grade: Grade level (e.g., "Grade 10")
             subject: Subject name (e.g., "Mathematics")
+            max_workers: Worker processes (default: CPU count; 1 disables the pool)
 
         Returns:
             Dictionary mapping page number to extracted text
@@ -32,42 +201,36 @@ class TextbookLoader:
             FileNotFoundError: If PDF file doesn't exist
             Exception: If PDF extraction fails
         """
-        pdf_path = Path(pdf_path)
-
-        if not pdf_path.exists():
-            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
-
-        if not pdf_path.suffix.lower() == ".pdf":
-            raise ValueError(f"File must be a PDF: {pdf_path}")
-
-        page_texts = {}
+        pdf_path = self._check_pdf_path(pdf_path)
 
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                total_pages = len(pdf.pages)
+            version = _file_version(pdf_path)
+            max_workers = max_workers or os.cpu_count() or 1
+            page_texts = None
+
+            # One handle gives the page count and, for sequential loads, the pages
+            with _open_pdf(pdf_path, self.pdf_backend) as (total_pages, extract_page):
+                _remember_page_count(version, total_pages)
                 logger.info(
                     f"Loading PDF: {pdf_path.name} | "
                     f"Grade: {grade} | Subject: {subject} | "
                     f"Total pages: {total_pages}"
                 )
 
-                for page_num, page in enumerate(pdf.pages, start=1):
-                    try:
-                        text = page.extract_text()
-                        if text:
-                            # Clean up text
-                            text = self._clean_text(text)
-                            page_texts[page_num] = text
-                            logger.debug(
-                                f"Extracted {len(text)} characters from page {page_num}"
-                            )
-                        else:
-                            logger.warning(f"No text extracted from page {page_num}")
-                            page_texts[page_num] = ""
-
-                    except Exception as e:
-                        logger.error(f"Error extracting text from page {page_num}: {e}")
-                        page_texts[page_num] = ""
+                if max_workers == 1 or total_pages < _PARALLEL_MIN_PAGES:
+                    page_texts = dict(_extract_pages(extract_page, 1, total_pages + 1))
+
+            if page_texts is None:
+                step = -(-total_pages // max_workers)
+                starts = list(range(1, total_pages + 1, step))
+                ends = [min(start + step, total_pages + 1) for start in starts]
+
+                page_texts = {}
+                with ProcessPoolExecutor(max_workers=len(starts)) as executor:
+                    for part in executor.map(
+                        _extract_page_range, repeat(pdf_path), repeat(self.pdf_backend), starts, ends
+                    ):
+                        page_texts.update(part)
 
             logger.info(f"Successfully loaded {len(page_texts)} pages from {pdf_path.name}")
             return page_texts
@@ -76,6 +239,26 @@ class TextbookLoader:
             logger.error(f"Failed to load PDF {pdf_path}: {e}")
             raise
 
+    def iter_pages(self, pdf_path: str) -> Iterator[Tuple[int, str]]:
+        """
+        Stream a PDF's pages in order, extracting each one on demand
+
+        Only the current page is held in memory, so consumers (chunking,
+        embedding) can process pages as they arrive or stop early.
+
+        Args:
+            pdf_path: Path to the PDF file
+
+        Returns:
+            Iterator of (page_number, text) tuples
+
+        Raises:
+            FileNotFoundError: If PDF file doesn't exist
+        """
+        pdf_path = self._check_pdf_path(pdf_path)
+        logger.info(f"Streaming PDF: {pdf_path.name}")
+        return _iter_page_range(pdf_path, self.pdf_backend)
+
     def extract_all_pages(self, pdf_path: str) -> List[Tuple[int, str]]:
         """
         Extract all pages from a PDF as (page_number, text) tuples
@@ -86,8 +269,32 @@ class TextbookLoader:
         Returns:
             List of (page_number, text) tuples
         """
-        page_texts = self.load_pdf(pdf_path, grade="", subject="")
-        return [(page_num, text) for page_num, text in page_texts.items()]
+        return list(self.iter_pages(pdf_path))
+
+    @staticmethod
+    def _check_pdf_path(pdf_path: str) -> Path:
+        """
+        Check that a path points to an existing PDF file
+
+        Args:
+            pdf_path: Path to the PDF file
+
+        Returns:
+            The path as a Path
+
+        Raises:
+            FileNotFoundError: If PDF file doesn't exist
+            ValueError: If the file is not a PDF
+        """
+        pdf_path = Path(pdf_path)
+
+        if not pdf_path.exists():
+            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+
+        if not pdf_path.suffix.lower() == ".pdf":
+            raise ValueError(f"File must be a PDF: {pdf_path}")
+
+        return pdf_path
 
     @staticmethod
     def _clean_text(text: str) -> str:
@@ -100,16 +307,8 @@ class TextbookLoader:
         Returns:
             Cleaned text
         """
-        # Remove extra whitespace
-        lines = text.split("\n")
-        cleaned_lines = [line.strip() for line in lines if line.strip()]
-        cleaned_text = " ".join(cleaned_lines)
-
-        # Replace multiple spaces with single space
-        while "  " in cleaned_text:
-            cleaned_text = cleaned_text.replace("  ", " ")
-
-        return cleaned_text
+        # Collapse line breaks and runs of whitespace into single spaces
+        return " ".join(text.split())
 
     def get_page_count(self, pdf_path: str) -> int:
         """
@@ -127,8 +326,15 @@ class TextbookLoader:
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
 
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                return len(pdf.pages)
+            version = _file_version(pdf_path)
+            page_count = _page_counts.get(version)
+
+            if page_count is None:
+                with _open_pdf(pdf_path, self.pdf_backend) as (total_pages, _):
+                    page_count = total_pages
+            _remember_page_count(version, page_count)
+
+            return page_count
         except Exception as e:
             logger.error(f"Failed to get page count for {pdf_path}: {e}")
             raise
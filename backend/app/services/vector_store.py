@@ -5,6 +5,7 @@ import logging
 from typing import List, Tuple, Dict, Optional
 import numpy as np
 import joblib
+from app import config
 
 try:
     import faiss
@@ -13,27 +14,80 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+if faiss is not None:
+    # Brute-force scans and batched searches use this process's share of the cores
+    faiss.omp_set_num_threads(config.FAISS_OMP_THREADS)
+
+INDEX_TYPES = ("flat", "flat_fp16", "hnsw", "ivfpq")
+
+# HNSW graph parameters
+_HNSW_M = 32
+_HNSW_EF_CONSTRUCTION = 200
+_HNSW_EF_SEARCH = 64
+
+# IVF-PQ parameters: FAISS wants ~39 training vectors per centroid, and 8-bit
+# codes give each sub-quantizer 256 centroids
+_IVFPQ_BITS = 8
+_IVFPQ_MIN_TRAIN = 39 * 2 ** _IVFPQ_BITS
+_IVFPQ_SUBVECTOR_DIM = 8
+_IVFPQ_NPROBE = 8
+
+# Exhaustive indexes move to the GPU (if faiss-gpu is installed) from this size
+_GPU_MIN_VECTORS = 100_000
+
+
+def _normalized(embeddings: np.ndarray) -> np.ndarray:
+    """Return a float32 copy of the embeddings scaled to unit length"""
+    embeddings = np.array(embeddings, dtype=np.float32, order="C")
+    faiss.normalize_L2(embeddings)
+    return embeddings
+
 
 class VectorStore:
-    """Manages embeddings and FAISS index for semantic search"""
+    """
+    Manages embeddings and FAISS index for semantic search
+
+    Embeddings and queries are normalized to unit length and compared by
+    inner product, so search scores are cosine similarities (higher is better).
+    """
 
-    def __init__(self, embedding_dim: int = 384):
+    def __init__(self, embedding_dim: int = 384, index_type: str = "flat"):
         """
         Initialize vector store
 
         Args:
             embedding_dim: Dimension of embeddings (default: 384 for sentence-transformers)
+            index_type: "flat" (exact search), "flat_fp16" (exact search over
+                vectors stored as float16), "hnsw" (graph-based approximate
+                search) or "ivfpq" (compressed approximate search)
         """
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown index type {index_type!r}. Supported: {INDEX_TYPES}")
+
         self.embedding_dim = embedding_dim
+        self.index_type = index_type
         self.index = None
+        self._on_gpu = False
         self.chunk_metadata = []
-        self.embeddings = None
+        # Added batches, concatenated lazily by the embeddings property
+        self._embedding_chunks: List[np.ndarray] = []
 
         if faiss is None:
             logger.warning(
                 "FAISS not installed. Install with: pip install faiss-cpu or faiss-gpu"
             )
 
+    @property
+    def embeddings(self) -> Optional[np.ndarray]:
+        """All added embeddings as one array (None if nothing was added)"""
+        if not self._embedding_chunks:
+            return None
+
+        if len(self._embedding_chunks) > 1:
+            self._embedding_chunks = [np.concatenate(self._embedding_chunks)]
+
+        return self._embedding_chunks[0]
+
     def create_index(self, embeddings: np.ndarray) -> None:
         """
         Create FAISS index from embeddings
@@ -50,13 +104,100 @@ class VectorStore:
                 f"expected dimension {self.embedding_dim}"
             )
 
-        self.embeddings = embeddings
+        embeddings = _normalized(embeddings)
 
         # Create index
-        self.index = faiss.IndexFlatL2(self.embedding_dim)
-        self.index.add(embeddings.astype(np.float32))
+        index = self._build_index(embeddings)
+        index.add(embeddings)
+
+        self.index, self._on_gpu = self._maybe_to_gpu(index)
+        self._embedding_chunks = [embeddings]
+
+        logger.info(
+            f"Created FAISS {self.index_type} index with {embeddings.shape[0]} vectors"
+        )
+
+    def _build_index(self, embeddings: np.ndarray):
+        """
+        Build an empty (trained, if needed) FAISS index of the configured type
+
+        Args:
+            embeddings: Initial embeddings, used to train IVF-PQ indexes
+
+        Returns:
+            FAISS index ready for add()
+        """
+        if self.index_type == "hnsw":
+            index = faiss.IndexHNSWFlat(self.embedding_dim, _HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = _HNSW_EF_CONSTRUCTION
+            index.hnsw.efSearch = _HNSW_EF_SEARCH
+            return index
+
+        if self.index_type == "ivfpq":
+            n_samples = embeddings.shape[0]
+            if n_samples < _IVFPQ_MIN_TRAIN:
+                # Too few vectors to train good codebooks; exact fp16 search is
+                # both small and accurate at this size
+                logger.warning(
+                    f"IVF-PQ index needs at least {_IVFPQ_MIN_TRAIN} embeddings to train, "
+                    f"got {n_samples}; falling back to flat_fp16"
+                )
+                self.index_type = "flat_fp16"
+                return self._build_index(embeddings)
+            if self.embedding_dim % _IVFPQ_SUBVECTOR_DIM:
+                raise ValueError(
+                    f"IVF-PQ index needs an embedding dimension divisible by "
+                    f"{_IVFPQ_SUBVECTOR_DIM}, got {self.embedding_dim}"
+                )
+
+            # ~sqrt(N) lists, each with enough points to train its centroid
+            n_lists = max(1, min(int(np.sqrt(n_samples)), n_samples // 39))
+            quantizer = faiss.IndexFlatIP(self.embedding_dim)
+            index = faiss.IndexIVFPQ(
+                quantizer,
+                self.embedding_dim,
+                n_lists,
+                self.embedding_dim // _IVFPQ_SUBVECTOR_DIM,
+                _IVFPQ_BITS,
+                faiss.METRIC_INNER_PRODUCT,
+            )
+            index.train(embeddings)
+            index.nprobe = min(_IVFPQ_NPROBE, n_lists)
+            return index
+
+        if self.index_type == "flat_fp16":
+            # Stores half-precision codes: half the memory and index file size
+            return faiss.IndexScalarQuantizer(
+                self.embedding_dim, faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_INNER_PRODUCT
+            )
 
-        logger.info(f"Created FAISS index with {embeddings.shape[0]} vectors")
+        return faiss.IndexFlatIP(self.embedding_dim)
+
+    def _maybe_to_gpu(self, index):
+        """
+        Move a large exhaustive index onto all available GPUs
+
+        Args:
+            index: Populated CPU index
+
+        Returns:
+            Tuple of (index, on_gpu)
+        """
+        if (
+            self.index_type not in ("flat", "flat_fp16")
+            or index.ntotal < _GPU_MIN_VECTORS
+            or not hasattr(faiss, "get_num_gpus")
+            or faiss.get_num_gpus() == 0
+        ):
+            return index, False
+
+        try:
+            gpu_index = faiss.index_cpu_to_all_gpus(index)
+            logger.info(f"Moved FAISS index to {faiss.get_num_gpus()} GPU(s)")
+            return gpu_index, True
+        except Exception as e:
+            logger.warning(f"Could not move FAISS index to GPU, staying on CPU: {e}")
+            return index, False
 
     def add_embeddings(self, embeddings: np.ndarray, metadata: List[Dict]) -> None:
         """
@@ -75,9 +216,10 @@ class VectorStore:
         if self.index is None:
             self.create_index(embeddings)
         else:
-            # Add to existing index
-            self.index.add(embeddings.astype(np.float32))
-            self.embeddings = np.vstack([self.embeddings, embeddings])
+            # Add to existing index; batches are only concatenated on access
+            embeddings = _normalized(embeddings)
+            self.index.add(embeddings)
+            self._embedding_chunks.append(embeddings)
 
         self.chunk_metadata.extend(metadata)
         logger.info(f"Added {len(embeddings)} embeddings to index. Total: {self.index.ntotal}")
@@ -91,22 +233,44 @@ class VectorStore:
             k: Number of nearest neighbors to return
 
         Returns:
-            List of (chunk_id, distance, metadata) tuples, sorted by relevance
+            List of (chunk_id, score, metadata) tuples, highest score first
         """
         if self.index is None:
             logger.warning("Index is empty, returning no results")
             return []
 
-        if len(query_embedding.shape) == 1:
-            query_embedding = query_embedding.reshape(1, -1)
+        return self.search_batch(query_embedding.reshape(1, -1), k)[0]
+
+    def search_batch(
+        self, query_embeddings: np.ndarray, k: int = 5
+    ) -> List[List[Tuple[int, float, Dict]]]:
+        """
+        Search for similar chunks for several queries in one FAISS call
 
-        distances, indices = self.index.search(query_embedding.astype(np.float32), k)
+        Args:
+            query_embeddings: Array of shape (n_queries, embedding_dim)
+            k: Number of nearest neighbors to return per query
 
+        Returns:
+            One list of (chunk_id, score, metadata) tuples per query, highest score first
+        """
+        if self.index is None:
+            logger.warning("Index is empty, returning no results")
+            return [[] for _ in range(len(query_embeddings))]
+
+        scores, indices = self.index.search(_normalized(query_embeddings), k)
+
+        n_metadata = len(self.chunk_metadata)
         results = []
-        for dist, idx in zip(distances[0], indices[0]):
-            if idx < len(self.chunk_metadata):
-                metadata = self.chunk_metadata[idx]
-                results.append((idx, float(dist), metadata))
+        for row_scores, row_indices in zip(scores.tolist(), indices.tolist()):
+            # Approximate indexes pad missing results with -1
+            results.append(
+                [
+                    (idx, score, self.chunk_metadata[idx])
+                    for score, idx in zip(row_scores, row_indices)
+                    if 0 <= idx < n_metadata
+                ]
+            )
 
         return results
 
@@ -122,7 +286,7 @@ class VectorStore:
             k: Number of neighbors to return
 
         Returns:
-            List of (chunk_id, distance, metadata) tuples
+            List of (chunk_id, score, metadata) tuples
         """
         query_embedding = embedder(query_text)
         return self.search(query_embedding, k)
@@ -140,7 +304,8 @@ class VectorStore:
             return
 
         try:
-            faiss.write_index(self.index, index_path)
+            index = faiss.index_gpu_to_cpu(self.index) if self._on_gpu else self.index
+            faiss.write_index(index, index_path)
             joblib.dump(
                 {
                     "metadata": self.chunk_metadata,
@@ -153,16 +318,25 @@ class VectorStore:
             logger.error(f"Failed to save index: {e}")
             raise
 
-    def load(self, index_path: str, metadata_path: str) -> None:
+    def load(self, index_path: str, metadata_path: str, mmap: bool = True) -> None:
         """
         Load index and metadata from disk
 
+        By default the index file is memory-mapped read-only, so pages are
+        faulted in on demand instead of reading the whole file at start-up.
+        A memory-mapped IVF index cannot be extended; load with mmap=False
+        before adding embeddings to it.
+
         Args:
             index_path: Path to FAISS index
             metadata_path: Path to metadata
+            mmap: Memory-map the index file instead of reading it into memory
         """
         try:
-            self.index = faiss.read_index(index_path)
+            self.index = self._read_index(index_path, mmap)
+            self._on_gpu = False
+            # Raw embeddings are not saved; drop any buffered from the previous index
+            self._embedding_chunks = []
 
             data = joblib.load(metadata_path)
             self.chunk_metadata = data["metadata"]
@@ -173,6 +347,19 @@ class VectorStore:
             logger.error(f"Failed to load index: {e}")
             raise
 
+    @staticmethod
+    def _read_index(index_path: str, mmap: bool):
+        """Read a FAISS index, memory-mapped if requested and supported"""
+        if mmap:
+            try:
+                return faiss.read_index(
+                    index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY
+                )
+            except RuntimeError as e:
+                logger.warning(f"Could not memory-map {index_path}, reading it instead: {e}")
+
+        return faiss.read_index(index_path)
+
     def is_empty(self) -> bool:
         """Check if index is empty"""
         return self.index is None or self.index.ntotal == 0
@@ -6,9 +6,14 @@ Usage:
     
 Or for development with auto-reload:
     python run.py --reload
+
+Or with several worker processes:
+    python run.py --workers 4
 """
+import os
 import sys
 import argparse
+import importlib.util
 from pathlib import Path
 import logging
 
@@ -24,10 +29,12 @@ logger = logging.getLogger(__name__)
 
 def check_models_exist():
     """Check if trained models exist"""
-    classifier_exists = config.CLASSIFIER_MODEL_PATH.exists()
-    vectorizer_exists = config.VECTORIZER_MODEL_PATH.exists()
+    return config.GUARDRAIL_MODEL_PATH.exists()
+
 
-    return classifier_exists and vectorizer_exists
+def has_module(name: str) -> bool:
+    """Check if an optional module is installed"""
+    return importlib.util.find_spec(name) is not None
 
 
 def main():
@@ -49,6 +56,12 @@ def main():
         default=8000,
         help="Port to bind to (default: 8000)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1; ignored with --reload)",
+    )
     parser.add_argument(
         "--train",
         action="store_true",
@@ -57,6 +70,10 @@ def main():
 
     args = parser.parse_args()
 
+    if args.reload and args.workers > 1:
+        print("⚠️  --reload runs a single process; ignoring --workers")
+        args.workers = 1
+
     # Check and train models if needed
     if args.train or not check_models_exist():
         print("\n" + "=" * 60)
@@ -84,6 +101,7 @@ def main():
     print(f"Host: {args.host}")
     print(f"Port: {args.port}")
     print(f"Auto-reload: {args.reload}")
+    print(f"Workers: {args.workers}")
     print("\n📖 API Documentation:")
     print(f"   Swagger UI: http://{args.host}:{args.port}/docs")
     print(f"   ReDoc: http://{args.host}:{args.port}/redoc")
@@ -91,11 +109,19 @@ def main():
     print(f"   curl http://{args.host}:{args.port}/health")
     print("\n" + "=" * 60 + "\n")
 
+    # Worker processes read this (see config.FAISS_OMP_THREADS) to split the
+    # cores between them instead of each starting one thread per core
+    os.environ["WEB_CONCURRENCY"] = str(args.workers)
+
+    # uvloop and httptools ship with uvicorn[standard] (uvloop is not available on Windows)
     uvicorn.run(
         "app.main:app",
         host=args.host,
         port=args.port,
         reload=args.reload,
+        workers=args.workers,
+        loop="uvloop" if has_module("uvloop") else "asyncio",
+        http="httptools" if has_module("httptools") else "h11",
         log_level="info",
     )
 
@@ -52,6 +52,177 @@ def test_guardrail():
         return False
 
 
+def test_guardrail_batcher():
+    """Test guardrail batcher coalescing, ordering, errors, fallback and shutdown"""
+    logger.info("\n" + "=" * 60)
+    logger.info("Testing Guardrail Batcher")
+    logger.info("=" * 60)
+
+    import asyncio
+    from app.services.guardrail_batcher import GuardrailBatcher
+
+    class FakeGuardrail:
+        """Answers (True, len(question)) and records every batch it sees"""
+
+        def __init__(self, fail=False):
+            self.fail = fail
+            self.batches = []
+            self.direct_calls = 0
+
+        def batch_check(self, questions):
+            self.batches.append(list(questions))
+            if self.fail:
+                raise RuntimeError("model exploded")
+            return [(True, float(len(q))) for q in questions]
+
+        def is_in_syllabus(self, question):
+            self.direct_calls += 1
+            return True, float(len(question))
+
+    questions = [f"question {'x' * i}" for i in range(10)]
+    expected = [(True, float(len(q))) for q in questions]
+
+    async def check_batching():
+        fake = FakeGuardrail()
+        batcher = GuardrailBatcher(fake, max_batch_size=4, max_wait_ms=200)
+        batcher.start()
+        try:
+            results = await asyncio.gather(*(batcher.is_in_syllabus(q) for q in questions))
+        finally:
+            await batcher.stop()
+
+        assert [len(b) for b in fake.batches] == [4, 4, 2], f"Batches: {fake.batches}"
+        assert results == expected, "Results not returned in submission order"
+
+    async def check_errors():
+        batcher = GuardrailBatcher(FakeGuardrail(fail=True), max_batch_size=4, max_wait_ms=200)
+        batcher.start()
+        try:
+            results = await asyncio.gather(
+                *(batcher.is_in_syllabus(q) for q in questions[:3]), return_exceptions=True
+            )
+        finally:
+            await batcher.stop()
+
+        assert all(isinstance(r, RuntimeError) for r in results), f"Results: {results}"
+
+    async def check_fallback():
+        fake = FakeGuardrail()
+        batcher = GuardrailBatcher(fake)
+        result = await batcher.is_in_syllabus(questions[0])
+
+        assert result == expected[0] and fake.direct_calls == 1 and not fake.batches
+
+    async def check_stop_drains():
+        fake = FakeGuardrail()
+        batcher = GuardrailBatcher(fake, max_batch_size=4, max_wait_ms=1000)
+        batcher.start()
+        pending = [asyncio.ensure_future(batcher.is_in_syllabus(q)) for q in questions]
+        await asyncio.sleep(0)
+        await batcher.stop()
+
+        assert all(f.done() for f in pending), "stop() left requests unanswered"
+        assert [f.result() for f in pending] == expected
+        assert sum(len(b) for b in fake.batches) == len(questions)
+
+    try:
+        for check in (check_batching, check_errors, check_fallback, check_stop_drains):
+            asyncio.run(check())
+            logger.info(f"  {check.__name__}: ok")
+
+        logger.info("✅ Guardrail batcher tests passed!")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ Guardrail batcher test failed: {e!r}")
+        return False
+
+
+def test_prediction_cache():
+    """Test the persistent guardrail prediction cache"""
+    logger.info("\n" + "=" * 60)
+    logger.info("Testing Prediction Cache (SQLite)")
+    logger.info("=" * 60)
+
+    import os
+    import sqlite3
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor
+    from app import config
+    from app.services.guardrail import Guardrail
+    from app.services.prediction_cache import PredictionCache
+
+    original_cache_path = config.PREDICTION_CACHE_PATH
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = Path(tmp_dir) / "predictions.db"
+
+            # (prediction, confidence) survives the <Bd payload exactly
+            cache = PredictionCache(str(db_path), "model-a")
+            cache.put_many({"what is photosynthesis?": (1, 0.7342518)})
+            assert cache.get("what is photosynthesis?") == (1, 0.7342518)
+            assert cache.get("never stored") is None
+
+            # Another model's writes to the shared file are never served
+            other = PredictionCache(str(db_path), "model-b")
+            cache.put_many({"stale question": (0, 0.9)})
+            assert other.get("stale question") is None, "Served another model's entry"
+            assert other.make_key("q") != cache.make_key("q")
+            cache.close()
+
+            # Many threads reading and writing through one connection
+            def worker(i):
+                batch = {f"thread {i} question {j}": (j % 2, j / 100) for j in range(50)}
+                other.put_many(batch)
+                return all(other.get(q) == result for q, result in batch.items())
+
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                assert all(pool.map(worker, range(16))), "Concurrent get/put mismatch"
+            other.close()
+            logger.info("  payload, key namespacing and concurrent access: ok")
+
+            # Namespace follows the model file's size and mtime
+            config.PREDICTION_CACHE_PATH = db_path
+            model_path = Path(tmp_dir) / "model.joblib"
+            model_path.write_bytes(b"model v1")
+
+            guardrail = Guardrail()
+            guardrail._open_disk_cache(model_path)
+            first_cache = guardrail._disk_cache
+            first_namespace = first_cache.namespace
+
+            stat = model_path.stat()
+            os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            guardrail._open_disk_cache(model_path)
+            mtime_namespace = guardrail._disk_cache.namespace
+
+            model_path.write_bytes(b"model v2, longer")
+            guardrail._open_disk_cache(model_path)
+            size_namespace = guardrail._disk_cache.namespace
+
+            assert len({first_namespace, mtime_namespace, size_namespace}) == 3
+
+            # Reopening closed the previous connection
+            try:
+                first_cache._conn.execute("SELECT 1")
+                raise AssertionError("Old cache connection still open")
+            except sqlite3.ProgrammingError:
+                pass
+            guardrail._disk_cache.close()
+            logger.info("  namespace per model file and reopen: ok")
+
+        logger.info("✅ Prediction cache tests passed!")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ Prediction cache test failed: {e!r}")
+        return False
+
+    finally:
+        config.PREDICTION_CACHE_PATH = original_cache_path
+
+
 def test_chunker():
     """Test text chunking"""
     logger.info("\n" + "=" * 60)
@@ -176,6 +347,80 @@ def test_classifier_training():
         return False
 
 
+def test_classifier_retraining():
+    """Test warm-start retraining through train_model.py's --retrain entry point"""
+    logger.info("\n" + "=" * 60)
+    logger.info("Testing Syllabus Classifier Retraining")
+    logger.info("=" * 60)
+
+    import tempfile
+    from app.services.syllabus_classifier import SyllabusClassifier
+    from train_model import retrain_guardrail_model
+
+    try:
+        in_syllabus = [
+            "What is photosynthesis in plants?",
+            "Explain photosynthesis in green plants",
+            "How does evaporation of water work?",
+            "Describe evaporation of water from oceans",
+            "What is a chemical reaction in chemistry?",
+            "Give an example of a chemical reaction",
+        ]
+        out_of_syllabus = [
+            "How do I invest money in stocks?",
+            "Which stocks should I invest money in?",
+            "What is the price of cryptocurrency today?",
+            "Should I buy cryptocurrency at this price?",
+            "How do I get rich quickly with money?",
+            "Tips to get rich quickly",
+        ]
+        questions = in_syllabus + out_of_syllabus
+        labels = [1] * len(in_syllabus) + [0] * len(out_of_syllabus)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            model_path = Path(tmp_dir) / "model.joblib"
+            matrix_path = Path(tmp_dir) / "matrix.joblib"
+            csv_path = Path(tmp_dir) / "new.csv"
+
+            classifier = SyllabusClassifier(
+                n_estimators=20, min_samples_split=2, min_samples_leaf=1, rf_n_jobs=1
+            )
+            classifier.train(questions, labels)
+            classifier.save(str(model_path))
+            classifier.save_training_matrix(str(matrix_path))
+            old_predictions, _ = classifier.predict_batch(questions)
+
+            csv_path.write_text(
+                "question,label\n"
+                "Why is photosynthesis important for plants?,1\n"
+                "Is it a good time to invest in cryptocurrency?,0\n",
+                encoding="utf-8",
+            )
+            assert retrain_guardrail_model(
+                str(csv_path), n_new_estimators=5, model_path=model_path, matrix_path=matrix_path
+            ), "Retraining failed"
+
+            retrained = SyllabusClassifier()
+            retrained.load(str(model_path), mmap_mode=None)
+            retrained.load_training_matrix(str(matrix_path))
+
+            n_estimators = retrained.classifier.n_estimators
+            new_predictions, _ = retrained.predict_batch(questions)
+            logger.info(f"Forest grew from 20 to {n_estimators} trees")
+
+            assert n_estimators == 25, f"Expected 25 trees, got {n_estimators}"
+            assert len(retrained.classifier.estimators_) == 25
+            assert retrained._train_X.shape[0] == len(questions) + 2
+            assert new_predictions == old_predictions, "Retraining changed old predictions"
+
+        logger.info("✅ Classifier retraining tests passed!")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ Classifier retraining test failed: {e!r}")
+        return False
+
+
 def test_ai_engine():
     """Test AI engine"""
     logger.info("\n" + "=" * 60)
@@ -216,6 +461,40 @@ def test_ai_engine():
         return False
 
 
+def test_ai_engine_whitespace_context():
+    """Test summary extraction stays fast on whitespace-heavy context"""
+    logger.info("\n" + "=" * 60)
+    logger.info("Testing AI Engine (whitespace-heavy context)")
+    logger.info("=" * 60)
+
+    import time
+    from app import config
+    from app.services.ai_engine import AIEngine
+
+    try:
+        context = "x. " + " " * config.MAX_CONTEXT_CHARS
+
+        start = time.perf_counter()
+        summary = AIEngine._extract_summary_from_context(context)
+        elapsed = time.perf_counter() - start
+
+        logger.info(f"Summary of {len(context)}-char context in {elapsed * 1000:.2f} ms")
+        assert summary == "x.", f"Unexpected summary: {summary!r}"
+        assert elapsed < 0.05, f"Summary extraction took {elapsed:.3f}s"
+
+        summary = AIEngine._extract_summary_from_context(
+            "  First one.   Second one!\n\n Third one? Fourth."
+        )
+        assert summary == "First one. Second one! Third one?", f"Unexpected summary: {summary!r}"
+
+        logger.info("✅ AI Engine whitespace tests passed!")
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ AI Engine whitespace test failed: {e}")
+        return False
+
+
 def test_api_endpoints():
     """Test FastAPI endpoints"""
     logger.info("\n" + "=" * 60)
@@ -269,10 +548,14 @@ def main():
 
     results = {
         "Guardrail": test_guardrail(),
+        "Guardrail Batcher": test_guardrail_batcher(),
+        "Prediction Cache": test_prediction_cache(),
         "Chunker": test_chunker(),
         "Vector Store": test_vector_store(),
         "Classifier": test_classifier_training(),
+        "Classifier Retraining": test_classifier_retraining(),
         "AI Engine": test_ai_engine(),
+        "AI Engine (whitespace)": test_ai_engine_whitespace_context(),
         "API Endpoints": test_api_endpoints(),
     }
 
@@ -2,16 +2,20 @@
 Script to train the guardrail Random Forest classifier
 
 Usage:
-    python train_model.py
+    python train_model.py [--smoke-test]
+    python train_model.py --retrain new_questions.csv [--new-trees N]
 """
+import argparse
+import csv
 import sys
 import logging
 from pathlib import Path
+from typing import List, Optional, Tuple
+import numpy as np
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-import pandas as pd
 from app.services.syllabus_classifier import SyllabusClassifier
 from app import config
 
@@ -23,47 +27,101 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def train_guardrail_model(csv_path: str = "data/training/question_labels.csv"):
+def load_labeled_questions(csv_path: Path) -> Optional[Tuple[List[str], np.ndarray]]:
+    """
+    Load de-duplicated questions and validated 0/1 labels from a training CSV
+
+    Args:
+        csv_path: Path to a CSV with "question" and "label" columns
+
+    Returns:
+        Tuple of (questions, int8 labels), or None if the file is invalid
+    """
+    # Load training data
+    logger.info("Loading training data from %s", csv_path)
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+
+        # Check for required columns
+        required_columns = ["question", "label"]
+        columns = set(header)
+        missing_cols = [col for col in required_columns if col not in columns]
+
+        if missing_cols:
+            logger.error("Missing required columns: %s", missing_cols)
+            return None
+
+        # Extract questions and labels in one streaming pass, so only these
+        # two columns are kept rather than every parsed row
+        question_idx = header.index("question")
+        label_idx = header.index("label")
+        questions = []
+
+        def iter_labels():
+            for row in reader:
+                if row:
+                    questions.append(row[question_idx])
+                    yield int(row[label_idx])
+
+        # Parsed as int64 so out-of-range labels are caught below rather
+        # than wrapping around in a narrower dtype
+        labels = np.fromiter(iter_labels(), dtype=np.int64)
+
+    logger.info("Loaded %d samples", len(questions))
+    logger.info("Columns: %s", header)
+    logger.info("Shape: (%d, %d)", len(questions), len(header))
+
+    # Validate labels
+    invalid = (labels != 0) & (labels != 1)
+    if invalid.any():
+        invalid_labels = np.unique(labels[invalid]).tolist()
+        logger.error("Invalid labels found: %s. Must be 0 or 1.", invalid_labels)
+        return None
+
+    labels = labels.astype(np.int8)
+    logger.info("Unique labels: %s", np.unique(labels).tolist())
+
+    # Drop repeated questions, keeping the first label seen for each
+    first_index = {}
+    for i, question in enumerate(questions):
+        first_index.setdefault(question, i)
+
+    n_duplicates = len(questions) - len(first_index)
+    if n_duplicates:
+        logger.info(
+            "Removed %d duplicate questions (%.1f%% of samples)",
+            n_duplicates,
+            100 * n_duplicates / len(questions),
+        )
+        questions = list(first_index)
+        labels = labels[np.fromiter(first_index.values(), dtype=np.intp, count=len(first_index))]
+
+    return questions, labels
+
+
+def train_guardrail_model(
+    csv_path: str = "data/training/question_labels.csv",
+    smoke_test: bool = False,
+):
     """
     Train the Random Forest guardrail classifier
 
     Args:
         csv_path: Path to training data CSV
+        smoke_test: Classify a few sample questions with the trained model
     """
     csv_path = Path(csv_path)
 
     if not csv_path.exists():
-        logger.error(f"Training data file not found: {csv_path}")
+        logger.error("Training data file not found: %s", csv_path)
         return False
 
     try:
-        # Load training data
-        logger.info(f"Loading training data from {csv_path}")
-        df = pd.read_csv(csv_path)
-
-        logger.info(f"Loaded {len(df)} samples")
-        logger.info(f"Columns: {df.columns.tolist()}")
-        logger.info(f"Shape: {df.shape}")
-
-        # Check for required columns
-        required_columns = ["question", "label"]
-        missing_cols = [col for col in required_columns if col not in df.columns]
-
-        if missing_cols:
-            logger.error(f"Missing required columns: {missing_cols}")
+        loaded = load_labeled_questions(csv_path)
+        if loaded is None:
             return False
-
-        # Extract questions and labels
-        questions = df["question"].tolist()
-        labels = df["label"].tolist()
-
-        # Validate labels
-        unique_labels = set(labels)
-        if not unique_labels.issubset({0, 1}):
-            logger.error(f"Invalid labels found: {unique_labels}. Must be 0 or 1.")
-            return False
-
-        logger.info(f"Unique labels: {sorted(unique_labels)}")
+        questions, labels = loaded
 
         # Initialize classifier with optimized hyperparameters
         logger.info("Initializing Random Forest classifier...")
@@ -75,51 +133,130 @@ def train_guardrail_model(csv_path: str = "data/training/question_labels.csv"):
             tfidf_max_features=config.TFIDF_MAX_FEATURES,
             tfidf_min_df=config.TFIDF_MIN_DF,
             tfidf_max_df=config.TFIDF_MAX_DF,
+            tfidf_dtype=np.float32,
+            rf_n_jobs=config.RF_N_JOBS,
         )
 
         # Train model
         logger.info("Training classifier...")
         classifier.train(questions, labels)
 
-        # Get feature importance
-        logger.info("\nTop 10 most important features:")
+        # Get feature importance (logged as one block)
         top_features = classifier.get_feature_importance(top_n=10)
-        for feature, importance in top_features:
-            logger.info(f"  {feature}: {importance:.4f}")
+        lines = ["\nTop 10 most important features:"]
+        lines.extend(f"  {feature}: {importance:.4f}" for feature, importance in top_features)
+        logger.info("%s", "\n".join(lines))
 
         # Create models directory
         config.MODELS_DIR.mkdir(parents=True, exist_ok=True)
 
         # Save model
-        logger.info(f"\nSaving model to {config.MODELS_DIR}")
-        classifier.save(
-            str(config.CLASSIFIER_MODEL_PATH),
-            str(config.VECTORIZER_MODEL_PATH),
-        )
+        logger.info("\nSaving model to %s", config.MODELS_DIR)
+        classifier.save(str(config.GUARDRAIL_MODEL_PATH), compress=config.GUARDRAIL_MODEL_COMPRESS)
+        classifier.save_training_matrix(str(config.GUARDRAIL_TRAIN_MATRIX_PATH))
 
         logger.info("✅ Model training completed successfully!")
 
         # Test the trained model
-        logger.info("\n--- Testing trained model ---")
-        test_questions = [
-            "What is photosynthesis?",
-            "How do I become a programmer?",
-            "Solve x² + 5x + 6 = 0",
-        ]
-
-        for q in test_questions:
-            pred, conf = classifier.predict(q)
-            label = "IN-SYLLABUS" if pred == 1 else "OUT-OF-SYLLABUS"
-            logger.info(f"Q: {q}")
-            logger.info(f"   → {label} (confidence: {conf:.3f})")
+        if smoke_test:
+            logger.info("\n--- Testing trained model ---")
+            test_questions = [
+                "What is photosynthesis?",
+                "How do I become a programmer?",
+                "Solve x² + 5x + 6 = 0",
+            ]
+
+            predictions, confidences = classifier.predict_batch(test_questions)
+            lines = []
+            for q, pred, conf in zip(test_questions, predictions, confidences):
+                label = "IN-SYLLABUS" if pred == 1 else "OUT-OF-SYLLABUS"
+                lines.append(f"Q: {q}")
+                lines.append(f"   → {label} (confidence: {conf:.3f})")
+            logger.info("%s", "\n".join(lines))
+
+        return True
+
+    except Exception as e:
+        logger.error("Error training model: %s", e, exc_info=True)
+        return False
+
+
+def retrain_guardrail_model(
+    csv_path: str,
+    n_new_estimators: int = 10,
+    model_path: Path = config.GUARDRAIL_MODEL_PATH,
+    matrix_path: Path = config.GUARDRAIL_TRAIN_MATRIX_PATH,
+):
+    """
+    Grow the saved guardrail forest with newly labelled questions
+
+    Loads the saved model and its TF-IDF training matrix, adds trees fitted
+    on the old and new samples together (see SyllabusClassifier.retrain),
+    and saves both artifacts back so the next retrain builds on this one.
 
+    Args:
+        csv_path: Path to a CSV of new questions ("question" and "label" columns)
+        n_new_estimators: Number of trees to add to the forest
+        model_path: Saved model bundle to update
+        matrix_path: Saved training matrix to update
+    """
+    csv_path = Path(csv_path)
+
+    for path in (csv_path, Path(model_path), Path(matrix_path)):
+        if not path.exists():
+            logger.error("Required file not found: %s", path)
+            return False
+
+    try:
+        loaded = load_labeled_questions(csv_path)
+        if loaded is None:
+            return False
+        questions, labels = loaded
+
+        # Read into memory: the files are overwritten below
+        classifier = SyllabusClassifier(rf_n_jobs=config.RF_N_JOBS)
+        classifier.load(str(model_path), mmap_mode=None)
+        classifier.load_training_matrix(str(matrix_path))
+
+        n_before = classifier.classifier.n_estimators
+        classifier.retrain(questions, labels, n_new_estimators=n_new_estimators)
+        logger.info(
+            "Forest grown from %d to %d trees", n_before, classifier.classifier.n_estimators
+        )
+
+        classifier.save(str(model_path), compress=config.GUARDRAIL_MODEL_COMPRESS)
+        classifier.save_training_matrix(str(matrix_path))
+
+        logger.info("✅ Model retraining completed successfully!")
         return True
 
     except Exception as e:
-        logger.error(f"Error training model: {e}", exc_info=True)
+        logger.error("Error retraining model: %s", e, exc_info=True)
         return False
 
 
 if __name__ == "__main__":
-    success = train_guardrail_model()
+    parser = argparse.ArgumentParser(description="Train the guardrail classifier")
+    parser.add_argument(
+        "--smoke-test",
+        action="store_true",
+        help="Classify a few sample questions after training",
+    )
+    parser.add_argument(
+        "--retrain",
+        metavar="CSV",
+        help="Add trees for the new questions in CSV to the saved model instead of training from scratch",
+    )
+    parser.add_argument(
+        "--new-trees",
+        type=int,
+        default=10,
+        help="Number of trees to add with --retrain (default: 10)",
+    )
+    args = parser.parse_args()
+
+    if args.retrain:
+        success = retrain_guardrail_model(args.retrain, n_new_estimators=args.new_trees)
+    else:
+        success = train_guardrail_model(smoke_test=args.smoke_test)
     sys.exit(0 if success else 1)
@@ -2,121 +2,151 @@
 Project Verification Checklist
 This script verifies that all required files and dependencies are in place
 """
+import argparse
+import os
+import stat
 import sys
-from pathlib import Path
-
-def check_file_exists(file_path: str, description: str) -> bool:
-    """Check if a file exists and print status"""
-    exists = Path(file_path).exists()
-    status = "✅" if exists else "❌"
-    print(f"{status} {description}")
-    return exists
-
-def check_directory_exists(dir_path: str, description: str) -> bool:
-    """Check if a directory exists and print status"""
-    exists = Path(dir_path).is_dir()
-    status = "✅" if exists else "❌"
-    print(f"{status} {description}")
-    return exists
+from concurrent.futures import ThreadPoolExecutor
+
+# One row per check: (section, kind, path, description), where kind is "dir" or "file"
+MANIFEST = (
+    ("📁 PROJECT STRUCTURE", "dir", "backend", "backend/ folder"),
+    ("📁 PROJECT STRUCTURE", "dir", "backend/app", "backend/app/ folder"),
+    ("📁 PROJECT STRUCTURE", "dir", "backend/app/routes", "backend/app/routes/ folder"),
+    ("📁 PROJECT STRUCTURE", "dir", "backend/app/services", "backend/app/services/ folder"),
+    ("📁 PROJECT STRUCTURE", "dir", "backend/app/models", "backend/app/models/ folder"),
+    ("📁 PROJECT STRUCTURE", "dir", "backend/data", "backend/data/ folder"),
+    ("📁 PROJECT STRUCTURE", "dir", "backend/data/textbooks", "backend/data/textbooks/ folder"),
+    ("📁 PROJECT STRUCTURE", "dir", "backend/data/textbooks/raw_pdfs", "backend/data/textbooks/raw_pdfs/ folder"),
+    ("📁 PROJECT STRUCTURE", "dir", "backend/data/training", "backend/data/training/ folder"),
+    ("🐍 CORE APPLICATION FILES", "file", "backend/app/__init__.py", "app/__init__.py"),
+    ("🐍 CORE APPLICATION FILES", "file", "backend/app/main.py", "app/main.py (FastAPI)"),
+    ("🐍 CORE APPLICATION FILES", "file", "backend/app/config.py", "app/config.py (configuration)"),
+    ("🐍 CORE APPLICATION FILES", "file", "backend/app/routes/__init__.py", "routes/__init__.py"),
+    ("🐍 CORE APPLICATION FILES", "file", "backend/app/routes/chat.py", "routes/chat.py (API endpoints)"),
+    ("🐍 CORE APPLICATION FILES", "file", "backend/app/services/__init__.py", "services/__init__.py"),
+    ("🐍 CORE APPLICATION FILES", "file", "backend/app/services/guardrail.py", "services/guardrail.py (safety)"),
+    ("🐍 CORE APPLICATION FILES", "file", "backend/app/services/syllabus_classifier.py", "services/syllabus_classifier.py (ML)"),
+    ("🐍 CORE APPLICATION FILES", "file", "backend/app/services/ai_engine.py", "services/ai_engine.py (answer gen)"),
+    ("🐍 CORE APPLICATION FILES", "file", "backend/app/services/vector_store.py", "services/vector_store.py (FAISS)"),
+    ("🐍 CORE APPLICATION FILES", "file", "backend/app/services/chunker.py", "services/chunker.py (text chunking)"),
+    ("🐍 CORE APPLICATION FILES", "file", "backend/app/services/textbook_loader.py", "services/textbook_loader.py (PDF)"),
+    ("🐍 CORE APPLICATION FILES", "file", "backend/app/models/__init__.py", "models/__init__.py"),
+    ("🐍 CORE APPLICATION FILES", "file", "backend/app/models/schema.py", "models/schema.py (Pydantic)"),
+    ("⚙️ CONFIGURATION & DEPENDENCIES", "file", "backend/requirements.txt", "requirements.txt (dependencies)"),
+    ("⚙️ CONFIGURATION & DEPENDENCIES", "file", "backend/.gitignore", ".gitignore"),
+    ("🚀 SCRIPTS", "file", "backend/run.py", "run.py (startup script)"),
+    ("🚀 SCRIPTS", "file", "backend/train_model.py", "train_model.py (training)"),
+    ("🚀 SCRIPTS", "file", "backend/test_integration.py", "test_integration.py (tests)"),
+    ("📚 DOCUMENTATION", "file", "backend/README.md", "backend/README.md"),
+    ("📚 DOCUMENTATION", "file", "backend/SETUP.md", "backend/SETUP.md"),
+    ("📚 DOCUMENTATION", "file", "README.md", "root/README.md"),
+    ("📚 DOCUMENTATION", "file", "PROJECT_SUMMARY.md", "PROJECT_SUMMARY.md"),
+    ("📊 DATA", "file", "backend/data/training/question_labels.csv", "question_labels.csv (training data)"),
+)
+
+# stat() calls are latency-bound on slow or networked filesystems, so run them concurrently
+_MAX_WORKERS = 16
+
+def _check(path: str, kind: str) -> bool:
+    """Check whether a path exists and is a directory ("dir") or regular file ("file")"""
+    try:
+        mode = os.stat(path).st_mode
+    except OSError:
+        return False
+    return stat.S_ISDIR(mode) if kind == "dir" else stat.S_ISREG(mode)
+
+def _run_checks(fail_fast: bool) -> list:
+    """
+    Run the manifest checks
+
+    Args:
+        fail_fast: Check serially and stop at the first failure
+
+    Returns:
+        Result per check, in manifest order (only the checks that ran)
+    """
+    if fail_fast:
+        results = []
+        for _, kind, path, _ in MANIFEST:
+            ok = _check(path, kind)
+            results.append(ok)
+            if not ok:
+                break
+        return results
+
+    kinds = [kind for _, kind, _, _ in MANIFEST]
+    paths = [path for _, _, path, _ in MANIFEST]
+    with ThreadPoolExecutor(max_workers=_MAX_WORKERS) as executor:
+        # map() yields results in submission order, so the report stays deterministic
+        return list(executor.map(_check, paths, kinds))
 
 def main():
     """Run verification checks"""
-    print("\n" + "=" * 70)
-    print("🔍 GURU.AI PROJECT VERIFICATION CHECKLIST")
-    print("=" * 70 + "\n")
-
-    all_checks = []
-
-    # Project structure
-    print("📁 PROJECT STRUCTURE")
-    print("-" * 70)
-    all_checks.append(check_directory_exists("backend", "backend/ folder"))
-    all_checks.append(check_directory_exists("backend/app", "backend/app/ folder"))
-    all_checks.append(check_directory_exists("backend/app/routes", "backend/app/routes/ folder"))
-    all_checks.append(check_directory_exists("backend/app/services", "backend/app/services/ folder"))
-    all_checks.append(check_directory_exists("backend/app/models", "backend/app/models/ folder"))
-    all_checks.append(check_directory_exists("backend/data", "backend/data/ folder"))
-    all_checks.append(check_directory_exists("backend/data/textbooks", "backend/data/textbooks/ folder"))
-    all_checks.append(check_directory_exists("backend/data/textbooks/raw_pdfs", "backend/data/textbooks/raw_pdfs/ folder"))
-    all_checks.append(check_directory_exists("backend/data/training", "backend/data/training/ folder"))
-
-    # Core application files
-    print("\n🐍 CORE APPLICATION FILES")
-    print("-" * 70)
-    all_checks.append(check_file_exists("backend/app/__init__.py", "app/__init__.py"))
-    all_checks.append(check_file_exists("backend/app/main.py", "app/main.py (FastAPI)"))
-    all_checks.append(check_file_exists("backend/app/config.py", "app/config.py (configuration)"))
-    all_checks.append(check_file_exists("backend/app/routes/__init__.py", "routes/__init__.py"))
-    all_checks.append(check_file_exists("backend/app/routes/chat.py", "routes/chat.py (API endpoints)"))
-    all_checks.append(check_file_exists("backend/app/services/__init__.py", "services/__init__.py"))
-    all_checks.append(check_file_exists("backend/app/services/guardrail.py", "services/guardrail.py (safety)"))
-    all_checks.append(check_file_exists("backend/app/services/syllabus_classifier.py", "services/syllabus_classifier.py (ML)"))
-    all_checks.append(check_file_exists("backend/app/services/ai_engine.py", "services/ai_engine.py (answer gen)"))
-    all_checks.append(check_file_exists("backend/app/services/vector_store.py", "services/vector_store.py (FAISS)"))
-    all_checks.append(check_file_exists("backend/app/services/chunker.py", "services/chunker.py (text chunking)"))
-    all_checks.append(check_file_exists("backend/app/services/textbook_loader.py", "services/textbook_loader.py (PDF)"))
-    all_checks.append(check_file_exists("backend/app/models/__init__.py", "models/__init__.py"))
-    all_checks.append(check_file_exists("backend/app/models/schema.py", "models/schema.py (Pydantic)"))
-
-    # Configuration and dependencies
-    print("\n⚙️ CONFIGURATION & DEPENDENCIES")
-    print("-" * 70)
-    all_checks.append(check_file_exists("backend/requirements.txt", "requirements.txt (dependencies)"))
-    all_checks.append(check_file_exists("backend/.gitignore", ".gitignore"))
-
-    # Scripts
-    print("\n🚀 SCRIPTS")
-    print("-" * 70)
-    all_checks.append(check_file_exists("backend/run.py", "run.py (startup script)"))
-    all_checks.append(check_file_exists("backend/train_model.py", "train_model.py (training)"))
-    all_checks.append(check_file_exists("backend/test_integration.py", "test_integration.py (tests)"))
-
-    # Documentation
-    print("\n📚 DOCUMENTATION")
-    print("-" * 70)
-    all_checks.append(check_file_exists("backend/README.md", "backend/README.md"))
-    all_checks.append(check_file_exists("backend/SETUP.md", "backend/SETUP.md"))
-    all_checks.append(check_file_exists("README.md", "root/README.md"))
-    all_checks.append(check_file_exists("PROJECT_SUMMARY.md", "PROJECT_SUMMARY.md"))
-
-    # Data
-    print("\n📊 DATA")
-    print("-" * 70)
-    all_checks.append(check_file_exists("backend/data/training/question_labels.csv", "question_labels.csv (training data)"))
+    parser = argparse.ArgumentParser(description="Guru.ai project verification checklist")
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop at the first failed check",
+    )
+    args = parser.parse_args()
+
+    # Collect the report and write it once instead of one print() per line
+    out = []
+    out.append("\n" + "=" * 70)
+    out.append("🔍 GURU.AI PROJECT VERIFICATION CHECKLIST")
+    out.append("=" * 70 + "\n")
+
+    all_checks = _run_checks(args.fail_fast)
+
+    current_section = None
+    for (section, _, _, description), ok in zip(MANIFEST, all_checks):
+        if section != current_section:
+            out.append(("\n" if current_section else "") + section)
+            out.append("-" * 70)
+            current_section = section
+        status = "✅" if ok else "❌"
+        out.append(f"{status} {description}")
+
+    if len(all_checks) < len(MANIFEST):
+        out.append(f"\n⏭️ Stopped at first failure; {len(MANIFEST) - len(all_checks)} checks skipped (--fail-fast)")
 
     # Summary
-    print("\n" + "=" * 70)
+    out.append("\n" + "=" * 70)
     total_checks = len(all_checks)
     passed_checks = sum(all_checks)
     failed_checks = total_checks - passed_checks
 
-    print(f"📊 VERIFICATION SUMMARY")
-    print("-" * 70)
-    print(f"Total Checks: {total_checks}")
-    print(f"✅ Passed: {passed_checks}")
-    print(f"❌ Failed: {failed_checks}")
+    out.append(f"📊 VERIFICATION SUMMARY")
+    out.append("-" * 70)
+    out.append(f"Total Checks: {total_checks}")
+    out.append(f"✅ Passed: {passed_checks}")
+    out.append(f"❌ Failed: {failed_checks}")
 
     if failed_checks == 0:
-        print("\n" + "=" * 70)
-        print("🎉 ALL CHECKS PASSED!")
-        print("=" * 70)
-        print("\n✨ Your Guru.ai backend is ready to use!")
-        print("\nNext steps:")
-        print("  1. cd backend")
-        print("  2. python -m venv venv")
-        print("  3. venv\\Scripts\\activate  # Windows (or source venv/bin/activate)")
-        print("  4. pip install -r requirements.txt")
-        print("  5. python run.py --train")
-        print("  6. python run.py")
-        print("\nThen visit: http://localhost:8000/docs")
-        print("=" * 70)
-        return 0
+        out.append("\n" + "=" * 70)
+        out.append("🎉 ALL CHECKS PASSED!")
+        out.append("=" * 70)
+        out.append("\n✨ Your Guru.ai backend is ready to use!")
+        out.append("\nNext steps:")
+        out.append("  1. cd backend")
+        out.append("  2. python -m venv venv")
+        out.append("  3. venv\\Scripts\\activate  # Windows (or source venv/bin/activate)")
+        out.append("  4. pip install -r requirements.txt")
+        out.append("  5. python run.py --train")
+        out.append("  6. python run.py")
+        out.append("\nThen visit: http://localhost:8000/docs")
+        out.append("=" * 70)
+        exit_code = 0
     else:
-        print("\n" + "=" * 70)
-        print("⚠️ SOME CHECKS FAILED")
-        print("=" * 70)
-        print("\nPlease ensure all files are present in the correct locations.")
-        return 1
+        out.append("\n" + "=" * 70)
+        out.append("⚠️ SOME CHECKS FAILED")
+        out.append("=" * 70)
+        out.append("\nPlease ensure all files are present in the correct locations.")
+        exit_code = 1
+
+    sys.stdout.write("\n".join(out) + "\n")
+    return exit_code
 
 
 if __name__ == "__main__":